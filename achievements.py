@@ -0,0 +1,125 @@
+import re
+
+# Per-line feature flags
+ACTION = 1
+ACHIEVEMENT = 2
+RECOGNITION = 4
+METRIC = 8
+
+
+def _points_for(flags: int) -> int:
+    """Points awarded to a line with the given flags (mirrors the original if/elif ladder)."""
+    action = bool(flags & ACTION)
+    achievement = bool(flags & ACHIEVEMENT)
+    recognition = bool(flags & RECOGNITION)
+    metric = bool(flags & METRIC)
+    if action and achievement and metric and recognition:
+        return 20
+    if action and achievement and metric:
+        return 18
+    if action and achievement:
+        return 15
+    if achievement and metric:
+        return 12
+    if action and metric:
+        return 10
+    if action:
+        return 5
+    if achievement:
+        return 7
+    if metric:
+        return 3
+    return 0
+
+
+# Every possible flag combination scored up front, so scoring a line is a table lookup
+POINTS_BY_FLAGS = tuple(_points_for(flags) for flags in range(16))
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+class AchievementClassifier:
+    """
+    Classifies resume lines into ACTION / ACHIEVEMENT / RECOGNITION / METRIC bitmasks.
+
+    The metric patterns are compiled into one alternation with a named group per
+    pattern, and each distinct token is lemmatized and looked up against the verb
+    sets only once; its flags are memoized for every later line, resume and batch.
+    """
+
+    MAX_CACHED_TOKENS = 100_000
+
+    def __init__(self, lemmatizer, action_lemmas, achievement_lemmas, recognition_lemmas, metric_patterns: dict):
+        self.lemmatizer = lemmatizer
+        self.action_lemmas = frozenset(action_lemmas)
+        self.achievement_lemmas = frozenset(achievement_lemmas)
+        self.recognition_lemmas = frozenset(recognition_lemmas)
+        self.metric_pattern = re.compile("|".join(
+            f"(?P<{name}>{pattern})" for name, pattern in metric_patterns.items()
+        ))
+        self._token_flags = {}
+
+    def token_flags(self, token: str) -> int:
+        flags = self._token_flags.get(token)
+        if flags is None:
+            lemma = self.lemmatizer.lemmatize(token)
+            flags = 0
+            if lemma in self.action_lemmas:
+                flags |= ACTION
+            if lemma in self.achievement_lemmas:
+                flags |= ACHIEVEMENT
+            if lemma in self.recognition_lemmas:
+                flags |= RECOGNITION
+            if len(self._token_flags) >= self.MAX_CACHED_TOKENS:
+                self._token_flags.clear()
+            self._token_flags[token] = flags
+        return flags
+
+    def line_flags(self, line: str) -> int:
+        """The combined flags of one line."""
+        flags = 0
+        # Once punctuation is stripped, splitting on whitespace yields the same words as word_tokenize
+        for token in _PUNCTUATION.sub('', line).lower().split():
+            flags |= self.token_flags(token)
+        if self.metric_pattern.search(line):
+            flags |= METRIC
+        return flags
+
+    def classify(self, lines) -> list:
+        """Flags for every line, classifying each distinct line only once."""
+        seen = {}
+        flags = []
+        for line in lines:
+            line_flags = seen.get(line)
+            if line_flags is None:
+                line_flags = seen[line] = self.line_flags(line)
+            flags.append(line_flags)
+        return flags
+
+    def classify_batch(self, documents_lines) -> list:
+        """Flags for the lines of many resumes at once, sharing work across the whole batch."""
+        documents_lines = [list(lines) for lines in documents_lines]
+        all_flags = self.classify(line for lines in documents_lines for line in lines)
+        results = []
+        offset = 0
+        for lines in documents_lines:
+            results.append(all_flags[offset:offset + len(lines)])
+            offset += len(lines)
+        return results
+
+    def metric_kind(self, line: str):
+        """Name of the first metric pattern found in the line (e.g. "percentage"), or None."""
+        match = self.metric_pattern.search(line)
+        return match.lastgroup if match else None
+
+
+def score_lines(lines, flags) -> tuple:
+    """Returns the total achievement score and the lines that earned points."""
+    total = 0
+    achievement_lines = []
+    for line, line_flags in zip(lines, flags):
+        points = POINTS_BY_FLAGS[line_flags]
+        if points:
+            total += points
+            achievement_lines.append(line)
+    return total, achievement_lines
@@ -1,18 +1,18 @@
 import streamlit as st
-import tempfile
-import shutil
-import os
-from parser import extract_text, parse_resume
-from new_scoring import score_resume
+from new_scoring import score_resume, score_resume_all_profiles
 from feedback import provide_comprehensive_feedback
-from utils import load_job_profiles
+from utils import get_profile_index
+from batch import BatchEvaluator, extract_and_parse, rank_candidates
+from document import ResumeDocument
+from cache import get_cache
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(page_title="Intelligent Resume Parser", layout="wide", page_icon="🚀")
 
 # --- LOAD RESOURCES ---
 try:
-    job_profiles = load_job_profiles()
+    # Compiled profiles, reloaded automatically whenever job_profile.json changes
+    job_profiles = get_profile_index().profiles
 except FileNotFoundError as e:
     st.error(f"Fatal Error: {e}. Please make sure 'job_profile.json' and 'skills.json' are in the same directory.")
     st.stop()
@@ -20,6 +20,11 @@ except Exception as e:
     st.error(f"An error occurred while loading resources: {e}")
     st.stop()
 
+@st.cache_resource
+def get_batch_evaluator():
+    """One warm worker pool shared by every session and rerun."""
+    return BatchEvaluator()
+
 # --- HEADER ---
 st.title("🚀 Intelligent Resume Parser")
 st.markdown("AI-powered resume analysis for recruiters and job seekers, built with a modern, evidence-based scoring engine.")
@@ -35,6 +40,11 @@ with st.sidebar:
     for category, roles in job_profiles.items():
         st.markdown(f"**{category}**: {len(roles)} roles")
 
+    st.markdown("---")
+    cache_stats = get_cache("parsed_resumes").stats()
+    st.caption(f"Parse cache hit rate: {cache_stats['hit_rate']:.0%} "
+               f"({cache_stats['memory_hits'] + cache_stats['disk_hits']} hits, {cache_stats['misses']} misses)")
+
 # --- MAIN APP LOGIC ---
 
 # 1. HR / Recruiter Flow
@@ -65,49 +75,57 @@ if user_type == "HR / Recruiter":
         help="Upload multiple resumes for batch processing and ranking."
     )
     
+    # Parsed candidates are kept for the session, keyed by the set of uploaded files,
+    # so changing the level or role only re-scores and re-ranks them.
+    upload_key = tuple((f.file_id, f.name, f.size) for f in uploaded_files) if uploaded_files else None
+    if upload_key != st.session_state.get("hr_upload_key"):
+        st.session_state.pop("hr_candidates", None)
+    
     if st.button("🔍 Evaluate Resumes", type="primary") and uploaded_files:
         if not selected_profile:
             st.error("Please select a valid job role before evaluating.")
         else:
             progress_bar = st.progress(0, text="Initializing evaluation...")
-            results = []
-            
-            for i, resume_file in enumerate(uploaded_files):
-                progress_bar.progress((i + 1) / len(uploaded_files), text=f"Processing {resume_file.name}...")
-                
-                with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(resume_file.name)[1]) as tmp:
-                    shutil.copyfileobj(resume_file, tmp)
-                    tmp_path = tmp.name
-                
-                try:
-                    raw_text = extract_text(tmp_path)
-                    parsed_data = parse_resume(raw_text)
-                    score_data = score_resume(parsed_data, selected_profile)
-                    results.append({"name": resume_file.name, "score": score_data["total_score"], "details": score_data})
-                except Exception as e:
-                    st.warning(f"Could not process {resume_file.name}. Error: {e}")
-                finally:
-                    os.unlink(tmp_path)
+
+            def update_progress(done, total, name):
+                progress_bar.progress(done / total, text=f"Processed {name} ({done}/{total})")
+
+            # Files are parsed in parallel, and the workers also compute everything that doesn't
+            # depend on the role (grammar check, achievements, title matches, ...); results come
+            # back in upload order
+            files = [(resume_file.name, resume_file.getvalue()) for resume_file in uploaded_files]
+            candidates = []
+            for result in get_batch_evaluator().prepare(files, job_profiles, progress=update_progress):
+                if "error" in result:
+                    st.warning(f"Could not process {result['name']}. Error: {result['error']}")
+                else:
+                    candidates.append({"name": result["name"], "document": result["document"]})
             
             progress_bar.empty()
-            
-            if results:
-                st.success(f"Evaluation complete! Processed {len(results)} resumes.")
-                sorted_results = sorted(results, key=lambda x: x["score"], reverse=True)
-                
-                for rank, result in enumerate(sorted_results, 1):
-                    with st.expander(f"#{rank}: **{result['name']}** — Score: {result['score']}/100", expanded=(rank <= 3)):
-                        st.subheader("Score Breakdown")
-                        score_details = result['details']
-                        cols = st.columns(4)
-                        cols[0].metric("Core Impact & Experience", f"{score_details['core_impact_score']}/45")
-                        cols[1].metric("Skill Alignment", f"{score_details['skill_alignment_score']}/25")
-                        cols[2].metric("Projects & Evidence", f"{score_details['projects_and_evidence_score']}/15")
-                        cols[3].metric("Presentation", f"{score_details['professional_presentation_score']}/15")
-
-                        with st.container():
-                            st.subheader("Parsed Information")
-                            st.json(score_details['parsed_data'], expanded=False)
+            st.session_state["hr_candidates"] = candidates
+            st.session_state["hr_upload_key"] = upload_key
+            if candidates:
+                st.success(f"Evaluation complete! Processed {len(candidates)} resumes.")
+
+    candidates = st.session_state.get("hr_candidates")
+    if candidates and selected_profile:
+        # Only the role-dependent scores are computed here; the rest came from the workers
+        sorted_results = rank_candidates(candidates, selected_profile)
+        st.subheader(f"Ranking for {job_category}")
+        
+        for rank, result in enumerate(sorted_results, 1):
+            with st.expander(f"#{rank}: **{result['name']}** — Score: {result['score']}/100", expanded=(rank <= 3)):
+                st.subheader("Score Breakdown")
+                score_details = result['details']
+                cols = st.columns(4)
+                cols[0].metric("Core Impact & Experience", f"{score_details['core_impact_score']}/45")
+                cols[1].metric("Skill Alignment", f"{score_details['skill_alignment_score']}/25")
+                cols[2].metric("Projects & Evidence", f"{score_details['projects_and_evidence_score']}/15")
+                cols[3].metric("Presentation", f"{score_details['professional_presentation_score']}/15")
+
+                with st.container():
+                    st.subheader("Parsed Information")
+                    st.json(score_details['parsed_data'], expanded=False)
 
 # 2. Job Seeker Flow
 elif user_type == "Job Seeker":
@@ -133,14 +151,10 @@ elif user_type == "Job Seeker":
             st.error("Please select a valid job role before analyzing.")
         else:
             with st.spinner("Our AI is reviewing your resume... This may take a moment."):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp:
-                    shutil.copyfileobj(uploaded_file, tmp)
-                    tmp_path = tmp.name
-                
                 try:
-                    raw_text = extract_text(tmp_path)
-                    parsed_data = parse_resume(raw_text)
-                    score_data = score_resume(parsed_data, selected_profile)
+                    parsed_data = extract_and_parse(uploaded_file.name, uploaded_file.getbuffer())["parsed_data"]
+                    document = ResumeDocument(parsed_data)
+                    score_data = score_resume(document, selected_profile)
                     
                     # --- Display Results ---
                     score = score_data['total_score']
@@ -156,9 +170,12 @@ elif user_type == "Job Seeker":
                     # Generate and display the detailed, AI-powered feedback
                     provide_comprehensive_feedback(score_data, selected_profile)
 
+                    # --- How the resume fits every other role archetype ---
+                    st.markdown("---")
+                    st.markdown("### 🎯 Best-Fit Roles")
+                    st.dataframe(score_resume_all_profiles(document, job_profiles), hide_index=True)
+
                 except Exception as e:
                     st.error(f"An error occurred during analysis: {e}")
-                finally:
-                    os.unlink(tmp_path)
 
 
@@ -0,0 +1,307 @@
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# Per-file time limit in seconds; a file that takes longer is reported as failed
+DEFAULT_TIMEOUT = 60
+
+# The error of a file whose worker process died while running it
+CRASHED = "Worker process crashed"
+
+
+class FileTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise FileTimeout()
+
+
+def _init_worker():
+    """Runs once in each worker process: load every model before taking jobs."""
+    import extractors
+    import ocr
+    from resources import warm_up
+    from new_scoring import get_achievement_classifier
+    # Files are already spread across the pool, so each worker reads and OCRs its PDF pages itself
+    extractors.PDF_WORKERS = 1
+    ocr.OCR_WORKERS = 1
+    try:
+        warm_up()
+        # Build the scorer's lazy tables too, so the first file isn't slower than the rest
+        get_achievement_classifier()
+    except Exception as e:
+        # Leave the error to surface per file instead of breaking the whole pool
+        print("Worker warm-up failed:", e)
+
+
+def _worker_ready() -> int:
+    # Holding each worker briefly makes the next task go to a different one
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def extract_and_parse(name: str, data) -> dict:
+    """
+    Extracts and parses an uploaded file (bytes or a memoryview of them), reusing
+    the cached result if these exact bytes were seen before by this parser version.
+    Returns {"text": ..., "parsed_data": ParsedResume}.
+    """
+    from parser import PARSER_VERSION, extract_text, parse_resume
+    from cache import content_key, get_cache
+    from records import RECORD_VERSION, ParsedResume, pack, unpack
+
+    cache = get_cache("parsed_resumes")
+    # The binary record format is part of the key, so entries from another format or Python are just misses
+    key = content_key(data, f"{PARSER_VERSION}:{RECORD_VERSION}")
+    cached = cache.get(key)
+    if cached is not None:
+        try:
+            raw_text, parsed_data = unpack(cached)
+            return {"text": raw_text, "parsed_data": ParsedResume.from_tuple(parsed_data)}
+        except (ValueError, EOFError, TypeError) as e:
+            print(f"Ignoring unreadable cache entry for {name}:", e)
+
+    # Parsed straight from memory: no temporary file, so this works on read-only filesystems too
+    raw_text = extract_text(data)
+    parsed_data = parse_resume(raw_text)
+    # Cached in the records' compact binary form rather than as JSON
+    cache.put(key, pack((raw_text, parsed_data.to_tuple())))
+    return {"text": raw_text, "parsed_data": parsed_data}
+
+
+def _run_with_time_limit(name: str, timeout: float, work) -> dict:
+    """
+    Runs work() under a per-file time limit.
+    Never raises: failures and timeouts are returned as {"name": ..., "error": ...}.
+    Timeouts (like worker crashes) are also marked "transient": True, since the
+    same file may well succeed on another try. Every result also gets "seconds",
+    the time spent on the file.
+    """
+    use_alarm = timeout and hasattr(signal, "setitimer")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        result = work()
+    except FileTimeout:
+        result = {"name": name, "error": f"Timed out after {timeout} seconds", "transient": True}
+    except Exception as e:
+        result = {"name": name, "error": str(e)}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+    result["seconds"] = time.perf_counter() - start
+    # Pool workers never run atexit handlers, so cache hit/miss counts are written per file
+    from cache import flush_caches
+    flush_caches()
+    return result
+
+
+def parse_file(name: str, data: bytes, timeout: float = DEFAULT_TIMEOUT) -> dict:
+    """Extracts and parses one uploaded file, returning {"name": ..., "parsed_data": ...}."""
+    def work():
+        return {"name": name, "parsed_data": extract_and_parse(name, data)["parsed_data"]}
+    return _run_with_time_limit(name, timeout, work)
+
+
+def prepare_file(name: str, data: bytes, job_profiles: dict = None, timeout: float = DEFAULT_TIMEOUT) -> dict:
+    """
+    Extracts and parses one uploaded file and computes its profile-independent
+    features (see new_scoring.precompute_features), returning {"name": ..., "document": ...}.
+    The document can then be scored against any profile without repeating that work.
+    """
+    from new_scoring import precompute_features
+
+    def work():
+        parsed_data = extract_and_parse(name, data)["parsed_data"]
+        return {"name": name, "document": precompute_features(parsed_data, job_profiles)}
+    return _run_with_time_limit(name, timeout, work)
+
+
+def evaluate_file(name: str, data: bytes, job_profile: dict, timeout: float = DEFAULT_TIMEOUT) -> dict:
+    """Runs the full pipeline (extract -> parse -> score) on one uploaded file."""
+    from new_scoring import score_resume
+
+    def work():
+        parsed_data = extract_and_parse(name, data)["parsed_data"]
+        score_data = score_resume(parsed_data, job_profile)
+        return {"name": name, "score": score_data["total_score"], "details": score_data}
+    return _run_with_time_limit(name, timeout, work)
+
+
+def rank_candidates(candidates, job_profile: dict) -> list:
+    """
+    Scores already-parsed candidates against a job profile, best first.
+    Candidates are {"name": ..., "document": ResumeDocument} entries (see
+    BatchEvaluator.prepare); because each document keeps its normalized text and
+    profile-independent results, switching roles only re-runs the profile-dependent
+    scoring.
+    """
+    from new_scoring import score_resume, score_skill_alignment_batch
+
+    # Skill alignment for every candidate at once; the rest is scored per candidate
+    skill_alignment = score_skill_alignment_batch([candidate["document"] for candidate in candidates], job_profile)
+    results = []
+    for candidate, skill_result in zip(candidates, skill_alignment):
+        score_data = score_resume(candidate["document"], job_profile, {"skill_alignment": skill_result})
+        results.append({"name": candidate["name"], "score": score_data["total_score"], "details": score_data})
+    return sorted(results, key=lambda x: x["score"], reverse=True)
+
+
+class BatchEvaluator:
+    """
+    Evaluates many resumes in parallel on a warm pool of worker processes.
+
+    Each worker loads spaCy, NLTK and the scorer's tables once when it starts, and
+    the pool is reused across calls. Each file runs under its own time limit and
+    a failure only affects that file. Results come back in upload order.
+    """
+
+    def __init__(self, max_workers: int = None, timeout: float = DEFAULT_TIMEOUT):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # "spawn" keeps workers independent of the threads Streamlit runs in this process
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return self._pool
+
+    def submit(self, func, *args):
+        """
+        Runs func(*args) on a worker, returning a concurrent.futures.Future.
+        If the pool has crashed since the last call, a fresh one is started.
+        """
+        try:
+            return self._get_pool().submit(func, *args)
+        except BrokenProcessPool:
+            self.shutdown()
+            return self._get_pool().submit(func, *args)
+
+    def warm_up(self):
+        """Starts every worker process and waits until each has loaded its models."""
+        # The pool starts a worker per task it can't hand to an idle one, and a worker only
+        # takes tasks once _init_worker has run, so a worker is warm once it has reported
+        # its pid. A fast worker can take several tasks; keep asking until all have reported.
+        ready = set()
+        while len(ready) < self.max_workers:
+            futures = [self.submit(_worker_ready) for _ in range(self.max_workers - len(ready))]
+            ready.update(future.result() for future in futures)
+        return ready
+
+    def evaluate(self, files, job_profile: dict, progress=None) -> list:
+        """
+        Evaluates (name, bytes) pairs against one job profile.
+        progress(done, total, name) is called from this thread as each file finishes.
+        """
+        files = list(files)
+        return self._run(files, lambda pool, name, data: pool.submit(
+            evaluate_file, name, data, job_profile, self.timeout
+        ), progress)
+
+    def iter_evaluate(self, files, job_profile: dict, max_pending: int = None):
+        """
+        Like evaluate(), but yields (index, result) in the order files finish.
+        files can be a lazy iterable of (name, bytes) pairs: with max_pending set,
+        only that many files are read and in flight at once, so a large directory
+        never has to fit in memory.
+        """
+        return self._iter_run(files, lambda pool, name, data: pool.submit(
+            evaluate_file, name, data, job_profile, self.timeout
+        ), max_pending)
+
+    def parse(self, files, progress=None) -> list:
+        """Extracts and parses (name, bytes) pairs without scoring them."""
+        files = list(files)
+        return self._run(files, lambda pool, name, data: pool.submit(
+            parse_file, name, data, self.timeout
+        ), progress)
+
+    def prepare(self, files, job_profiles: dict = None, progress=None) -> list:
+        """
+        Parses (name, bytes) pairs and computes their profile-independent features in
+        the workers; see prepare_file. Scoring the documents afterwards is cheap.
+        """
+        files = list(files)
+        return self._run(files, lambda pool, name, data: pool.submit(
+            prepare_file, name, data, job_profiles, self.timeout
+        ), progress)
+
+    def _run(self, files, submit, progress) -> list:
+        results = [None] * len(files)
+        for done, (index, result) in enumerate(self._iter_run(files, submit), start=1):
+            results[index] = result
+            if progress:
+                progress(done, len(files), files[index][0])
+        return results
+
+    def _iter_run(self, files, submit, max_pending: int = None):
+        # When a worker dies, every file in flight on its pool fails with BrokenProcessPool,
+        # and there is no telling which one killed it. Those files become suspects and are
+        # run again one at a time on a fresh pool: a suspect that crashes it on its own is
+        # the culprit and is reported as crashed, the others get their real result.
+        # No new files are started until every suspect has been retried.
+        pending = {}
+        suspects = deque()
+        files = enumerate(files)
+        exhausted = False
+        while True:
+            if suspects:
+                if not pending:
+                    self._submit_file(pending, submit, *suspects.popleft(), alone=True)
+            else:
+                while not exhausted and (max_pending is None or len(pending) < max_pending):
+                    try:
+                        index, (name, data) = next(files)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    self._submit_file(pending, submit, index, name, data, alone=False)
+            if not pending:
+                return
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, name, data, pool, alone = pending.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    if pool is self._pool:
+                        # Start a fresh pool for the retries and the files not yet submitted
+                        self.shutdown()
+                    if not alone:
+                        suspects.append((index, name, data))
+                        continue
+                    # It crashed a pool with nothing else running: this file is the cause
+                    result = {"name": name, "error": CRASHED, "seconds": 0.0, "transient": True}
+                except Exception as e:
+                    result = {"name": name, "error": str(e), "seconds": 0.0}
+                yield index, result
+
+    def _submit_file(self, pending: dict, submit, index: int, name: str, data, alone: bool):
+        pool = self._get_pool()
+        try:
+            future = submit(pool, name, data)
+        except BrokenProcessPool:
+            # The pool died since the last file finished; retry on a fresh one
+            self.shutdown()
+            pool = self._get_pool()
+            future = submit(pool, name, data)
+        pending[future] = (index, name, data, pool, alone)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
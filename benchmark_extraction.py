@@ -0,0 +1,223 @@
+"""
+Compares text extractors on a corpus of PDF and DOCX files.
+
+PDFs are run through every PDF engine in extractors.py; DOCX files through
+python-docx (paragraphs only, the old extractor) and the streaming reader. For
+each it reports throughput, peak memory (RSS growth while reading the whole
+corpus, measured in a fresh process) and text fidelity: the word-level
+similarity between the output and a reference text. A file's reference is the
+.txt file next to it (resume.pdf -> resume.pdf.txt); files without one are
+compared against the first extractor's output instead.
+
+    python benchmark_extraction.py path/to/corpus
+    python benchmark_extraction.py --generate 20 fixtures/   # write a synthetic corpus first
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import random
+import re
+import resource
+import statistics
+import time
+from difflib import SequenceMatcher
+
+from extractors import PDF_ENGINES, extract_docx_text, get_pdf_engine, text_quality
+
+SAMPLE_LINES = [
+    "Senior Software Engineer, Acme Corp | Jan 2019 - Present",
+    "Led a team of 6 engineers building the payments platform in Python and Go",
+    "Reduced API latency by 40% by introducing Redis caching and query batching",
+    "Data Analyst Intern, Globex | Jun 2017 - Aug 2017",
+    "Built Tableau dashboards tracking $2M in monthly revenue across 12 regions",
+    "Skills: Python, SQL, Docker, Kubernetes, AWS, React, TypeScript, PostgreSQL",
+    "B.Tech in Computer Science, State University, 2018 (GPA 8.7/10)",
+    "Projects: github.com/jdoe/resume-parser - NLP resume scoring with spaCy",
+    "Certifications: AWS Certified Solutions Architect - Associate (2021)",
+    "Mentored 4 junior developers and ran weekly code reviews",
+]
+
+
+# --- CORPUS ---
+
+def generate_pdf(path: str, rng: random.Random) -> list:
+    """Writes a 1-4 page resume PDF; returns its lines."""
+    import pymupdf
+
+    doc = pymupdf.open()
+    lines = []
+    for _ in range(rng.randint(1, 4)):
+        page = doc.new_page()
+        y = 60
+        for _ in range(rng.randint(20, 38)):
+            line = rng.choice(SAMPLE_LINES)
+            page.insert_text((50, y), line, fontsize=rng.choice([9, 10, 11]), fontname=rng.choice(["helv", "tiro", "cour"]))
+            lines.append(line)
+            y += 19
+    doc.save(path)
+    return lines
+
+
+def generate_docx(path: str, rng: random.Random, paragraphs: int) -> list:
+    """Writes a resume DOCX with a contact header, body paragraphs, a skills table and a footer; returns its lines."""
+    from docx import Document
+
+    doc = Document()
+    header = f"Jane Doe | jane.doe{rng.randint(1, 999)}@example.com | +1 555 0100"
+    doc.sections[0].header.paragraphs[0].text = header
+    lines = [header]
+    for _ in range(paragraphs):
+        line = rng.choice(SAMPLE_LINES)
+        doc.add_paragraph(line)
+        lines.append(line)
+    table = doc.add_table(rows=3, cols=2)
+    for row, (label, value) in enumerate([("Languages", "Python, Go, SQL"), ("Cloud", "AWS, GCP"), ("Tools", "Docker, Git")]):
+        table.cell(row, 0).text = label
+        table.cell(row, 1).text = value
+        lines += [label, value]
+    doc.sections[0].footer.paragraphs[0].text = "References available on request"
+    lines.append("References available on request")
+    doc.save(path)
+    return lines
+
+
+def generate_corpus(directory: str, count: int, seed: int = 0):
+    """Writes count synthetic PDFs and count DOCX files (every fifth one long) with .txt references."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    for n in range(count):
+        for ext, make in (("pdf", lambda path: generate_pdf(path, rng)),
+                          ("docx", lambda path: generate_docx(path, rng, 3000 if n % 5 == 4 else rng.randint(20, 60)))):
+            path = os.path.join(directory, f"resume_{n:03d}.{ext}")
+            lines = make(path)
+            with open(path + ".txt", "w") as f:
+                f.write("\n".join(lines))
+
+
+# --- EXTRACTORS ---
+
+def pdf_extractor(engine_name: str):
+    engine = get_pdf_engine(engine_name)
+    return lambda path: "\n".join(engine.page_range_text(path, 0, engine.page_count(path)))
+
+
+def python_docx_text(path: str) -> str:
+    from docx import Document
+    return "\n".join(para.text for para in Document(path).paragraphs)
+
+
+def get_extractors(pdf_engines) -> dict:
+    """{file extension: {extractor name: extract(path) -> text}}"""
+    return {
+        "pdf": {name: pdf_extractor(name) for name in pdf_engines},
+        "docx": {"python-docx": python_docx_text, "stream": extract_docx_text},
+    }
+
+
+# --- MEASUREMENTS ---
+
+def words(text: str) -> list:
+    return re.findall(r"\w+", text.lower())
+
+
+def fidelity(reference: str, text: str) -> float:
+    """Word-level similarity (0-1) of an extractor's output to the reference text."""
+    return SequenceMatcher(None, words(reference), words(text), autojunk=False).ratio()
+
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss is carried over from the parent process on Linux; VmHWM is this process's own
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _peak_memory_worker(ext: str, name: str, pdf_engines, paths) -> float:
+    extract = get_extractors(pdf_engines)[ext][name]
+    # Import everything the extractor needs before taking the baseline
+    extract(paths[0])
+    baseline = _peak_rss_kb()
+    for path in paths:
+        extract(path)
+    return (_peak_rss_kb() - baseline) / 1024
+
+
+def peak_memory_mb(ext: str, name: str, pdf_engines, paths) -> float:
+    """RSS growth (MB) while one extractor reads the corpus, in a fresh process so runs don't share a high-water mark."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_peak_memory_worker, (ext, name, list(pdf_engines), paths))
+
+
+def benchmark(paths, extractors: dict, ext: str, pdf_engines, repeat: int = 3) -> dict:
+    results = {}
+    outputs = {}
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    for name, extract in extractors.items():
+        seconds, texts = 0.0, {}
+        for path in paths:
+            runs = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                texts[path] = extract(path)
+                runs.append(time.perf_counter() - start)
+            seconds += statistics.median(runs)
+        outputs[name] = texts
+        results[name] = {
+            "files_per_s": len(paths) / seconds,
+            "mb_per_s": total_bytes / 1024 / 1024 / seconds,
+            "peak_mb": peak_memory_mb(ext, name, pdf_engines, paths),
+        }
+
+    first = next(iter(extractors))
+    for name in extractors:
+        scores, qualities = [], []
+        for path in paths:
+            if os.path.exists(path + ".txt"):
+                with open(path + ".txt") as f:
+                    reference = f.read()
+            else:
+                reference = outputs[first][path]
+            text = outputs[name][path]
+            scores.append(fidelity(reference, text))
+            qualities.append(text_quality(text))
+        results[name]["fidelity"] = statistics.mean(scores)
+        results[name]["min_fidelity"] = min(scores)
+        results[name]["quality"] = statistics.mean(qualities)
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("corpus", help="directory of PDF and DOCX files")
+    arg_parser.add_argument("--engines", default=",".join(PDF_ENGINES), help="comma-separated PDF engine names")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="timed runs per file (the median is used)")
+    arg_parser.add_argument("--generate", type=int, metavar="N", help="first write N synthetic PDFs and DOCX files into the corpus")
+    args = arg_parser.parse_args()
+
+    if args.generate:
+        generate_corpus(args.corpus, args.generate)
+    pdf_engines = [name.strip() for name in args.engines.split(",")]
+    found = False
+    for ext, extractors in get_extractors(pdf_engines).items():
+        paths = sorted(glob.glob(os.path.join(args.corpus, f"*.{ext}")))
+        if not paths:
+            continue
+        found = True
+        results = benchmark(paths, extractors, ext, pdf_engines, args.repeat)
+        print(f"\n{len(paths)} {ext.upper()} files")
+        print(f"{'extractor':<12} {'files/s':>9} {'MB/s':>7} {'peak MB':>8} {'fidelity':>9} {'min':>6} {'quality':>8}")
+        for name, r in results.items():
+            print(f"{name:<12} {r['files_per_s']:>9.1f} {r['mb_per_s']:>7.2f} {r['peak_mb']:>8.1f} "
+                  f"{r['fidelity']:>9.3f} {r['min_fidelity']:>6.3f} {r['quality']:>8.3f}")
+    if not found:
+        arg_parser.error(f"No PDF or DOCX files found in {args.corpus}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Where the on-disk tier lives; override with RESUME_PARSER_CACHE_DIR
+CACHE_DIR = os.environ.get("RESUME_PARSER_CACHE_DIR", ".cache")
+
+
+def content_key(data: bytes, version: str) -> str:
+    """A cache key for file contents: sha256 of the bytes, tagged with the code version that produced the value."""
+    return f"{hashlib.sha256(data).hexdigest()}:{version}"
+
+
+class LRUCache:
+    """A small thread-safe in-memory LRU dictionary."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ContentCache:
+    """
+    A two-tier cache of JSON-serializable values (or raw bytes, stored as they
+    are) keyed by content hash.
+
+    Lookups go to an in-memory LRU first, then to a SQLite file shared by every
+    process on the machine. The SQLite tier is trimmed to max_bytes, evicting the
+    least recently used entries first. With a ttl (in seconds), entries older than
+    that are treated as missing in both tiers. Hit and miss counts are kept per
+    process in `counters` and summed across processes in the database (see stats()).
+
+    Lookups don't write to the database: hit/miss counts and access times are
+    kept in memory and written in one transaction every FLUSH_INTERVAL seconds,
+    on stats(), at exit and whenever flush() is called (batch workers flush after
+    every file, since atexit doesn't run in pool workers). The total size of the entries is kept in the database
+    and updated with each write, so trimming never has to add up every entry.
+    """
+
+    FLUSH_INTERVAL = 10.0
+
+    def __init__(self, name: str, max_memory_entries: int = 256, max_bytes: int = 256 * 1024 * 1024,
+                 directory: str = CACHE_DIR, ttl: float = None):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.memory = LRUCache(max_memory_entries)
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._db = None
+        # Not yet written to the database: counter increments and {key: last access time}
+        self._unflushed_counts = dict.fromkeys(self.counters, 0)
+        self._unflushed_access = {}
+        self._last_flush = time.time()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self._db_path = os.path.join(directory, f"{name}.sqlite3")
+            self._db = sqlite3.connect(self._db_path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, value TEXT, size INTEGER, accessed REAL, created REAL)"
+            )
+            if "created" not in [row[1] for row in self._db.execute("PRAGMA table_info(entries)")]:
+                # Caches written before TTL support; their entries count as created now
+                self._db.execute("ALTER TABLE entries ADD COLUMN created REAL")
+                self._db.execute("UPDATE entries SET created = ?", (time.time(),))
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_created ON entries (created)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, count INTEGER)")
+            # The running total of entries.size, summed once for caches created before it was tracked
+            self._db.execute(
+                "INSERT OR IGNORE INTO counters (name, count) SELECT 'total_bytes', COALESCE(SUM(size), 0) FROM entries"
+            )
+            self._db.commit()
+        except (OSError, sqlite3.Error) as e:
+            # A read-only or full disk just means we run with the memory tier only
+            print(f"Disk cache '{name}' unavailable, using memory only:", e)
+            self._db = None
+        if self._db is not None:
+            atexit.register(self.flush)
+
+    def _count(self, counter: str):
+        self.counters[counter] += 1
+        self._unflushed_counts[counter] += 1
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, key: str):
+        entry = self.memory.get(key)
+        if entry is not None and not self._expired(entry[0]):
+            with self._lock:
+                self._count("memory_hits")
+                self._unflushed_access[key] = time.time()
+                self._flush_if_due()
+            return entry[1]
+        value = None
+        with self._lock:
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT value, created, size FROM entries WHERE key = ?", (key,)).fetchone()
+                    if row is not None and self._expired(row[1]):
+                        self._delete(key, row[2])
+                        self._db.commit()
+                    elif row is not None:
+                        self._unflushed_access[key] = time.time()
+                        value = row[0] if isinstance(row[0], bytes) else json.loads(row[0])
+                        entry = (row[1], value)
+                except sqlite3.Error:
+                    value = None
+            self._count("disk_hits" if value is not None else "misses")
+            self._flush_if_due()
+        if value is not None:
+            self.memory.put(key, entry)
+        return value
+
+    def put(self, key: str, value):
+        now = time.time()
+        self.memory.put(key, (now, value))
+        with self._lock:
+            if self._db is None:
+                return
+            # SQLite keeps bytes as a BLOB even in the TEXT column, which is how get() tells them apart
+            blob = value if isinstance(value, bytes) else json.dumps(value)
+            try:
+                # Takes back the size of the entry being replaced, if any, in the same transaction as the write
+                self._db.execute(
+                    "UPDATE counters SET count = count + ? - COALESCE((SELECT size FROM entries WHERE key = ?), 0) "
+                    "WHERE name = 'total_bytes'",
+                    (len(blob), key)
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, accessed, created) VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), now, now)
+                )
+                self._unflushed_access.pop(key, None)
+                self._evict()
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"Could not write to disk cache '{self.name}':", e)
+            self._flush_if_due()
+
+    def _add_to_total(self, delta: int):
+        self._db.execute("UPDATE counters SET count = count + ? WHERE name = 'total_bytes'", (delta,))
+
+    def _delete(self, key: str, size: int):
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._add_to_total(-size)
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        expired = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries WHERE created < ?", (cutoff,)).fetchone()[0]
+        if expired:
+            self._db.execute("DELETE FROM entries WHERE created < ?", (cutoff,))
+            self._add_to_total(-expired)
+
+    def _evict(self):
+        total = self._db.execute("SELECT count FROM counters WHERE name = 'total_bytes'").fetchone()[0]
+        if total > self.max_bytes and self.ttl is not None:
+            self._expire()
+            total = self._db.execute("SELECT count FROM counters WHERE name = 'total_bytes'").fetchone()[0]
+        while total > self.max_bytes:
+            row = self._db.execute("SELECT key, size FROM entries ORDER BY accessed LIMIT 1").fetchone()
+            if row is None:
+                break
+            self._delete(row[0], row[1])
+            total -= row[1]
+
+    def _flush_if_due(self):
+        if time.time() - self._last_flush >= self.FLUSH_INTERVAL:
+            self._flush()
+
+    def _flush(self):
+        """Writes the pending counts and access times (and drops expired entries). Call with _lock held."""
+        self._last_flush = time.time()
+        if self._db is None:
+            return
+        counts = [(name, count) for name, count in self._unflushed_counts.items() if count]
+        accesses = [(accessed, key) for key, accessed in self._unflushed_access.items()]
+        self._unflushed_counts = dict.fromkeys(self.counters, 0)
+        self._unflushed_access = {}
+        try:
+            self._db.executemany(
+                "INSERT INTO counters (name, count) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET count = count + excluded.count",
+                counts
+            )
+            self._db.executemany("UPDATE entries SET accessed = ? WHERE key = ?", accesses)
+            if self.ttl is not None:
+                self._expire()
+            self._db.commit()
+        except sqlite3.Error:
+            pass
+
+    def flush(self):
+        """Writes pending hit/miss counts and access times to the database now."""
+        with self._lock:
+            self._flush()
+
+    def stats(self) -> dict:
+        """Hit/miss counts and hit rate across every process sharing the disk cache."""
+        counts = dict(self.counters)
+        if self._db is not None:
+            with self._lock:
+                self._flush()
+                try:
+                    counts.update(dict(self._db.execute(
+                        "SELECT name, count FROM counters WHERE name != 'total_bytes'"
+                    ).fetchall()))
+                except sqlite3.Error:
+                    pass
+        lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+        counts["hit_rate"] = round((counts["memory_hits"] + counts["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return counts
+
+    def clear(self):
+        self.memory.clear()
+        with self._lock:
+            self._unflushed_counts = dict.fromkeys(self.counters, 0)
+            self._unflushed_access = {}
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+                self._db.execute("DELETE FROM counters")
+                self._db.execute("INSERT INTO counters (name, count) VALUES ('total_bytes', 0)")
+                self._db.commit()
+
+
+_caches = {}
+
+
+def flush_caches():
+    """Writes every cache's pending counts and access times, e.g. after each file in a worker process."""
+    for cache in list(_caches.values()):
+        cache.flush()
+
+
+def get_cache(name: str, **kwargs) -> ContentCache:
+    """The process-wide cache with the given name, created on first use."""
+    if name not in _caches:
+        _caches[name] = ContentCache(name, **kwargs)
+    return _caches[name]
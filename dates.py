@@ -0,0 +1,70 @@
+import re
+from datetime import date
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# One pattern shared by the parser and the scorers: "Jan 2020 - Present", "Sept. 2019 to Mar 2021", ...
+DATE_RANGE_PATTERN = re.compile(
+    r"((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4})\s*[-–to]+\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}|Present|Current)",
+    re.IGNORECASE
+)
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+
+class DateRange(NamedTuple):
+    """A normalized date range found in a resume, with its character offsets in the source text."""
+    start: date
+    end: Optional[date]  # None when the range is still ongoing
+    is_present: bool
+    start_text: str
+    end_text: str
+    pos: int
+    endpos: int
+
+    def end_or(self, today: date) -> date:
+        """The end of the range, using today for ongoing ranges."""
+        return today if self.is_present else self.end
+
+
+@lru_cache(maxsize=1024)
+def parse_month_year(text: str) -> Optional[date]:
+    """
+    Parses strings like "Jan 2020", "january 2020" or "Sept. 2019" to the first of that month.
+    Returns None if the string is not a month followed by a valid year.
+    """
+    parts = text.replace(".", " ").split()
+    if len(parts) != 2 or not parts[1].isdigit():
+        return None
+    month = MONTHS.get(parts[0][:3].lower())
+    if month is None:
+        return None
+    try:
+        return date(int(parts[1]), month, 1)
+    except ValueError:
+        # A year outside what date supports, e.g. "May 0000"
+        return None
+
+
+def find_date_ranges(text: str) -> list:
+    """Extracts every month-year date range in the text as a list of DateRange spans."""
+    ranges = []
+    for match in DATE_RANGE_PATTERN.finditer(text):
+        start_text, end_text = match.group(1), match.group(2)
+        start = parse_month_year(start_text)
+        if start is None:
+            continue
+        is_present = end_text.lower() in ("present", "current")
+        end = None if is_present else parse_month_year(end_text)
+        if not is_present and end is None:
+            continue
+        ranges.append(DateRange(start, end, is_present, start_text, end_text, match.start(), match.end()))
+    return ranges
+
+
+def months_between(start: date, end: date) -> int:
+    """Whole calendar months from start to end."""
+    return (end.year - start.year) * 12 + (end.month - start.month)
@@ -0,0 +1,140 @@
+import threading
+from functools import cached_property
+from itertools import chain
+from types import MappingProxyType
+
+from dates import find_date_ranges
+from records import ParsedResume
+
+
+def _flatten(value) -> list:
+    """Turns a resume_data value (list of lines, string, structured job, ...) into lines of text."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        lines = []
+        if value.get("start_date") and value.get("end_date"):
+            lines.append(f"{value['start_date']} - {value['end_date']}")
+        for key, item in value.items():
+            if key not in ("start_date", "end_date"):
+                lines.extend(_flatten(item))
+        return lines
+    if isinstance(value, (list, tuple)):
+        return list(chain.from_iterable(_flatten(item) for item in value))
+    return [str(value)]
+
+
+class ResumeDocument:
+    """
+    An immutable, lazily normalized view of a resume shared by every scorer.
+
+    Each derived form of the text (joined text, lowercase text, lines, date
+    ranges, per-section text) is computed on first access and then reused, so a
+    resume is normalized exactly once no matter how many scorers read it.
+    It also behaves like the original resume_data dict for .get() lookups.
+    A ParsedResume is kept as it is rather than copied into a dict, so holding
+    many documents costs little more than holding their records.
+    """
+
+    def __init__(self, resume_data: dict):
+        data = resume_data if isinstance(resume_data, ParsedResume) else MappingProxyType(dict(resume_data))
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "_section_cache", {})
+        object.__setattr__(self, "_features", {})
+        # One lock per memo key, so concurrent stages never compute the same feature twice
+        object.__setattr__(self, "_memo_locks", {})
+        object.__setattr__(self, "_memo_locks_lock", threading.Lock())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ResumeDocument is immutable")
+
+    def __reduce__(self):
+        # Only the data and the memoized features travel (e.g. back from a worker process);
+        # the normalized texts are cheap to derive again
+        data = self.data if isinstance(self.data, ParsedResume) else dict(self.data)
+        return _restore_document, (data, dict(self._features))
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def keys(self):
+        return self.data.keys()
+
+    def values(self):
+        return self.data.values()
+
+    def items(self):
+        return self.data.items()
+
+    @cached_property
+    def sections(self) -> dict:
+        """Each section of the resume as a tuple of text lines."""
+        return MappingProxyType({key: tuple(_flatten(value)) for key, value in self.data.items()})
+
+    @cached_property
+    def text(self) -> str:
+        """All sections joined into one newline-separated string."""
+        return "\n".join(chain.from_iterable(self.sections.values()))
+
+    @cached_property
+    def lower_text(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def lines(self) -> tuple:
+        return tuple(self.text.split("\n"))
+
+    @cached_property
+    def date_ranges(self) -> tuple:
+        """Every month-year date range in the resume, extracted once."""
+        return tuple(find_date_ranges(self.text))
+
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+    def section_lines(self, *names) -> tuple:
+        """The lines of the given sections, concatenated in the order requested."""
+        return tuple(chain.from_iterable(self.sections.get(name, ()) for name in names))
+
+    def section_text(self, *names, sep: str = "\n", lower: bool = False) -> str:
+        """The given sections joined with sep, optionally lowercased. Results are memoized."""
+        key = (names, sep, lower)
+        if key not in self._section_cache:
+            text = sep.join(self.section_lines(*names))
+            self._section_cache[key] = text.lower() if lower else text
+        return self._section_cache[key]
+
+    def memo(self, key, compute):
+        """
+        Returns compute(), computing it only the first time key is requested.
+        Used for profile-independent results (e.g. grammar errors) so that re-scoring
+        the same document against another profile does not repeat them. Threads
+        asking for the same key at once wait for the one computing it.
+        """
+        try:
+            return self._features[key]
+        except KeyError:
+            pass
+        with self._memo_locks_lock:
+            # Reentrant: a feature's compute() may read other features, or memo the same key itself
+            lock = self._memo_locks.setdefault(key, threading.RLock())
+        with lock:
+            if key not in self._features:
+                self._features[key] = compute()
+            return self._features[key]
+
+
+def _restore_document(data, features: dict) -> ResumeDocument:
+    document = ResumeDocument(data)
+    document._features.update(features)
+    return document
+
+
+def as_document(resume_data) -> ResumeDocument:
+    """Wraps resume_data in a ResumeDocument, reusing it if it already is one."""
+    if isinstance(resume_data, ResumeDocument):
+        return resume_data
+    return ResumeDocument(resume_data)
@@ -0,0 +1,438 @@
+import multiprocessing
+import os
+import io
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ocr import fill_sparse_pages
+
+# Limits on the PDFs we're willing to read; override with the environment variables below
+PDF_MAX_PAGES = int(os.environ.get("RESUME_PARSER_PDF_MAX_PAGES", "50"))
+PDF_MAX_BYTES = int(os.environ.get("RESUME_PARSER_PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+
+# PDFs with at least this many pages are split by page range across PDF_WORKERS processes
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("RESUME_PARSER_PDF_PARALLEL_MIN_PAGES", "16"))
+PDF_WORKERS = int(os.environ.get("RESUME_PARSER_PDF_WORKERS", str(min(os.cpu_count() or 1, 4))))
+
+# PDF engines to try, in order, until one produces clean text
+PDF_ENGINES = [name.strip() for name in os.environ.get("RESUME_PARSER_PDF_ENGINES", "pymupdf,pdfplumber").split(",")]
+
+# Text scoring below this (see text_quality) is treated as garbled and the next engine is tried
+MIN_TEXT_QUALITY = 0.8
+
+
+class ExtractionLimitError(ValueError):
+    """The file is larger than the configured extraction limits allow."""
+
+
+# --- INPUT SOURCES ---
+# A source is a file path or the file's bytes (bytes, bytearray or memoryview);
+# read_source turns anything else we accept into one of those.
+
+def read_source(source):
+    """
+    Normalizes an uploaded file for extraction without touching the disk.
+    Paths are kept as paths; in-memory buffers (BytesIO, Streamlit's UploadedFile)
+    are taken through their buffer; other file-like objects are read once.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer()
+    if hasattr(source, "read"):
+        return source.read()
+    raise TypeError(f"Cannot read a file from {type(source).__name__}")
+
+
+def source_size(source) -> int:
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    return memoryview(source).nbytes
+
+
+def source_head(source, size: int = 1024) -> bytes:
+    """The first size bytes; only those are copied out of a buffer."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read(size)
+    return bytes(memoryview(source)[:size])
+
+
+class BufferStream(io.RawIOBase):
+    """
+    A read-only, seekable file over a buffer that reads straight out of it.
+    io.BytesIO copies anything but a bytes object, which for an upload means
+    a second copy of the whole file just to open it.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def read(self, size: int = -1) -> bytes:
+        stop = len(self._view) if size is None or size < 0 else self._position + size
+        data = self._view[self._position:stop].tobytes()
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self._view[self._position:self._position + len(buffer)]
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+def as_stream(source):
+    """A path as is, or a seekable stream over the bytes for libraries that want a file object."""
+    if isinstance(source, str):
+        return source
+    if isinstance(source, bytes):
+        # BytesIO shares a bytes object's memory until something writes to it
+        return io.BytesIO(source)
+    return BufferStream(source)
+
+
+def detect_format(source):
+    """
+    "pdf" or "docx" from the file's magic bytes, or None.
+    PDFs start with %PDF- (some writers put junk before it, within the first
+    1 KB); DOCX files are zip archives containing word/document.xml.
+    """
+    head = source_head(source)
+    if b"%PDF-" in head:
+        return "pdf"
+    if head[:4] == b"PK\x03\x04":
+        try:
+            with zipfile.ZipFile(as_stream(source)) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return "docx"
+        except zipfile.BadZipFile:
+            return None
+    return None
+
+
+def check_file_size(source, max_bytes: int = PDF_MAX_BYTES):
+    size = source_size(source)
+    if max_bytes and size > max_bytes:
+        raise ExtractionLimitError(f"File is {size} bytes, over the {max_bytes} byte limit")
+
+
+# --- PDF ENGINES ---
+
+class PDFEngine:
+    """
+    A library that turns PDF pages into text.
+
+    Subclasses implement page_count(source) and page_range_text(source,
+    start, stop), which returns one string per page in [start, stop) (0-based).
+    A source is a file path or the PDF's bytes.
+    """
+
+    name = None
+
+    def page_count(self, source) -> int:
+        raise NotImplementedError
+
+    def page_range_text(self, source, start: int, stop: int) -> list:
+        raise NotImplementedError
+
+
+class PyMuPDFEngine(PDFEngine):
+    """MuPDF through PyMuPDF: several times faster than pdfplumber on typical resumes."""
+
+    name = "pymupdf"
+
+    def open(self, source):
+        try:
+            import pymupdf
+        except ImportError:
+            # Releases before 1.24 only ship the old module name
+            import fitz as pymupdf
+        if isinstance(source, str):
+            return pymupdf.open(source)
+        if isinstance(source, bytes):
+            return pymupdf.open(stream=source, filetype="pdf")
+        try:
+            # Current releases read a memoryview in place; bytearrays they would copy to bytes
+            return pymupdf.open(stream=memoryview(source), filetype="pdf")
+        except TypeError:
+            # Older releases only take bytes, bytearray or BytesIO
+            return pymupdf.open(stream=bytes(source), filetype="pdf")
+
+    def page_count(self, source) -> int:
+        with self.open(source) as doc:
+            return doc.page_count
+
+    def page_range_text(self, source, start: int, stop: int) -> list:
+        texts = []
+        with self.open(source) as doc:
+            for index in range(start, min(stop, doc.page_count)):
+                # sort=True reads blocks top to bottom, left to right, like pdfplumber does
+                texts.append(doc.load_page(index).get_text("text", sort=True).strip())
+        return texts
+
+
+class PDFPlumberEngine(PDFEngine):
+    """pdfminer through pdfplumber: slower, but copes with some PDFs MuPDF reads badly."""
+
+    name = "pdfplumber"
+
+    def page_count(self, source) -> int:
+        import pdfplumber
+        from pdfminer.pdftypes import resolve1
+
+        # Read the count from the page tree without parsing any page
+        with pdfplumber.open(as_stream(source), pages=[]) as pdf:
+            try:
+                return int(resolve1(pdf.doc.catalog["Pages"])["Count"])
+            except (KeyError, TypeError, ValueError):
+                pass
+        # A damaged page tree: fall back to walking it
+        with pdfplumber.open(as_stream(source)) as pdf:
+            return len(pdf.pages)
+
+    def page_range_text(self, source, start: int, stop: int) -> list:
+        import pdfplumber
+
+        texts = []
+        with pdfplumber.open(as_stream(source), pages=list(range(start + 1, stop + 1))) as pdf:
+            for page in pdf.pages:
+                texts.append(page.extract_text() or "")
+                # Release the page's layout objects as soon as its text is read
+                page.close()
+        return texts
+
+
+_pdf_engines = {}
+
+
+def register_pdf_engine(engine: PDFEngine):
+    """
+    Makes an engine available by name to extract_pdf_text and RESUME_PARSER_PDF_ENGINES.
+    Page-range workers are separate processes, so engines registered at runtime
+    must also be registered when this module is imported there.
+    """
+    _pdf_engines[engine.name] = engine
+
+
+def get_pdf_engine(name: str) -> PDFEngine:
+    if name not in _pdf_engines:
+        raise ValueError(f"Unknown PDF engine: {name}")
+    return _pdf_engines[name]
+
+
+register_pdf_engine(PyMuPDFEngine())
+register_pdf_engine(PDFPlumberEngine())
+
+
+def text_quality(text: str) -> float:
+    """
+    Rough share (0-1) of the text that reads as real text, 0 for no text.
+    Unmapped glyphs show up as "(cid:123)" markers, U+FFFD replacement
+    characters or stray control characters, which all count against the score.
+    """
+    stripped = re.sub(r"\s+", "", text)
+    if not stripped:
+        return 0.0
+    bad = sum(len(marker) for marker in re.findall(r"\(cid:\d+\)", stripped))
+    stripped = re.sub(r"\(cid:\d+\)", "", stripped)
+    bad += len(re.findall(r"[\ufffd\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", stripped))
+    return max(0.0, 1 - bad / (len(stripped) + bad))
+
+
+# --- PDF EXTRACTION ---
+
+def pdf_page_range_text(source, start: int, stop: int, engine: str = "pdfplumber") -> list:
+    """Text of pages [start, stop) with the named engine; a module-level function so workers can run it."""
+    return get_pdf_engine(engine).page_range_text(source, start, stop)
+
+
+_page_pool = None
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    global _page_pool
+    if _page_pool is None:
+        # "spawn" for the same reason as batch.BatchEvaluator: we may be called from Streamlit's threads
+        _page_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _page_pool
+
+
+def _extract_pages_in_parallel(source, page_count: int, workers: int, engine: str):
+    """Page texts of the first page_count pages, one page range per worker; None if the pool broke."""
+    global _page_pool
+    chunk = -(-page_count // workers)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    if isinstance(source, memoryview):
+        # Buffers can't be pickled; each worker gets its own copy of the bytes anyway
+        source = source.tobytes()
+    pool = _get_page_pool()
+    try:
+        futures = [pool.submit(pdf_page_range_text, source, start, stop, engine) for start, stop in ranges]
+        return [text for future in futures for text in future.result()]
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool next time and let the caller read the pages itself
+        print("PDF page pool crashed, extracting in this process")
+        pool.shutdown(wait=False, cancel_futures=True)
+        _page_pool = None
+        return None
+
+
+def extract_pdf_pages_with(engine: str, source, max_pages: int = None, workers: int = None) -> list:
+    """Text of each of the first max_pages pages of a PDF with one engine, in parallel for long PDFs."""
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    workers = PDF_WORKERS if workers is None else workers
+    page_count = get_pdf_engine(engine).page_count(source)
+    if max_pages and page_count > max_pages:
+        print(f"PDF has {page_count} pages; reading only the first {max_pages}")
+        page_count = max_pages
+
+    page_texts = None
+    if workers > 1 and page_count >= PDF_PARALLEL_MIN_PAGES:
+        page_texts = _extract_pages_in_parallel(source, page_count, workers, engine)
+    if page_texts is None:
+        page_texts = pdf_page_range_text(source, 0, page_count, engine)
+    return page_texts
+
+
+def extract_pdf_text(source, max_pages: int = None, max_bytes: int = None, workers: int = None,
+                     engines=None) -> str:
+    """
+    Extracts the text of a PDF (a path or its bytes), page by page.
+
+    Files over max_bytes are rejected with ExtractionLimitError; only the first
+    max_pages pages are read. PDFs with PDF_PARALLEL_MIN_PAGES pages or more are
+    split into page ranges and extracted on a process pool (pass workers=1 to stay
+    in this process, e.g. when already running inside a batch worker).
+
+    Engines are tried in order (PDF_ENGINES by default). If an engine isn't
+    installed, fails, or returns empty or garbled text, the next one is tried;
+    if none reads cleanly, the best text seen is used.
+
+    Finally, pages whose text layer is empty or sparse (scanned pages) are OCR'd;
+    see ocr.fill_sparse_pages. Pages with a real text layer never pay for OCR.
+    """
+    check_file_size(source, PDF_MAX_BYTES if max_bytes is None else max_bytes)
+    best_pages, best_quality = None, -1.0
+    errors = []
+    for engine in engines or PDF_ENGINES:
+        try:
+            page_texts = extract_pdf_pages_with(engine, source, max_pages, workers)
+        except ImportError as e:
+            errors.append(f"{engine}: not installed ({e})")
+            continue
+        except Exception as e:
+            errors.append(f"{engine}: {e}")
+            print(f"PDF engine '{engine}' failed:", e)
+            continue
+        quality = text_quality("".join(page_texts))
+        if quality > best_quality:
+            best_pages, best_quality = page_texts, quality
+        if quality >= MIN_TEXT_QUALITY:
+            break
+    if best_pages is None:
+        raise ValueError("Could not read PDF: " + "; ".join(errors))
+
+    # workers=1 means "stay in this process", which applies to OCR as well
+    page_texts = fill_sparse_pages(source, best_pages, workers=1 if workers == 1 else None)
+    return "".join(text + "\n" for text in page_texts if text)
+
+
+# --- DOCX EXTRACTION ---
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_RUN_TEXT = {_W + "tab": "\t", _W + "ptab": "\t", _W + "br": "\n", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+
+
+def _docx_parts(names) -> list:
+    """The parts of a DOCX that hold text, in reading order: headers, the body, then footers."""
+    def numbered(prefix):
+        parts = [name for name in names if name.startswith(prefix) and name.endswith(".xml")]
+        # header10.xml sorts after header2.xml
+        return sorted(parts, key=lambda name: (len(name), name))
+    return numbered("word/header") + ["word/document.xml"] + numbered("word/footer")
+
+
+def iter_docx_paragraphs(stream):
+    """
+    Yields the text of each paragraph in one DOCX XML part, in document order.
+
+    The part is parsed incrementally and every element is cleared as soon as
+    it is done with, so memory stays flat however large the document is. Table
+    cells and text boxes are made of ordinary paragraphs, so they come out as
+    lines too; a text box's lines come before the paragraph that anchors it.
+    Only the modern copy of a text box is read: the legacy VML copy that Word
+    stores next to it (mc:Fallback) is skipped, as are deleted revisions.
+    """
+    from xml.etree.ElementTree import iterparse
+
+    paragraphs = []
+    parents = []
+    skip_depth = 0
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            parents.append(tag)
+            if tag == _MC_FALLBACK:
+                skip_depth += 1
+            elif tag == _W + "p" and not skip_depth:
+                paragraphs.append([])
+            continue
+        parents.pop()
+        if tag == _MC_FALLBACK:
+            skip_depth -= 1
+        elif skip_depth:
+            pass
+        elif tag == _W + "p":
+            yield "".join(paragraphs.pop())
+        elif paragraphs and parents and parents[-1] == _W + "r":
+            # Only run content is text: w:tab also defines tab stops under w:pPr/w:tabs
+            text = _RUN_TEXT.get(tag)
+            if tag == _W + "t":
+                text = elem.text or ""
+            elif tag == _W + "br" and elem.get(_W + "type", "textWrapping") != "textWrapping":
+                text = ""  # page and column breaks, as python-docx reads them
+            if text:
+                paragraphs[-1].append(text)
+        elem.clear()
+
+
+def extract_docx_text(source) -> str:
+    """
+    Extracts the text of a DOCX file (a path or its bytes): headers, body
+    paragraphs, tables, text boxes and footers, in reading order.
+    The XML is streamed straight out of the zip; no document model is built.
+    """
+    lines = []
+    with zipfile.ZipFile(as_stream(source)) as archive:
+        names = set(archive.namelist())
+        for part in _docx_parts(names):
+            if part not in names:
+                continue
+            with archive.open(part) as stream:
+                lines.extend(iter_docx_paragraphs(stream))
+    return "".join(line + "\n" for line in lines)
@@ -0,0 +1,209 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+
+# A LanguageTool server to send text to, e.g. a self-hosted http://localhost:8081/v2/check.
+# Resume text only leaves the machine if this is set (the public API is
+# https://api.languagetool.org/v2/check, which is rate limited).
+LANGUAGETOOL_URL = os.environ.get("LANGUAGETOOL_URL")
+# Backend selection: "http" (the LanguageTool server above), "local" or "none".
+# Defaults to "http" when LANGUAGETOOL_URL is set and "local" otherwise.
+GRAMMAR_BACKEND = os.environ.get("RESUME_PARSER_GRAMMAR_BACKEND", "http" if LANGUAGETOOL_URL else "local")
+GRAMMAR_TIMEOUT = float(os.environ.get("RESUME_PARSER_GRAMMAR_TIMEOUT", "10"))
+
+MAX_TEXT_LENGTH = 2000
+
+# Grammar results are cached per unique text for this long (seconds)
+GRAMMAR_CACHE_TTL = float(os.environ.get("RESUME_PARSER_GRAMMAR_CACHE_TTL", str(30 * 24 * 3600)))
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing backend for a while.
+
+    After failure_threshold consecutive failures the circuit opens and calls fail
+    fast for reset_timeout seconds. Then one trial call is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError("Grammar backend unavailable, skipping check")
+            # Half-open: allow this one call through and restart the timer for any others
+            self._opened_at = time.monotonic()
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class GrammarBackend:
+    """
+    Counts grammar and spelling issues in a piece of text.
+
+    Subclasses implement _count(text, language). check() returns the number of
+    issues, or None if the backend failed, timed out or its circuit is open.
+    At most max_concurrency checks are sent to the backend at once.
+    """
+
+    def __init__(self, breaker: CircuitBreaker = None, max_concurrency: int = 8):
+        self.breaker = breaker or CircuitBreaker()
+        self.max_concurrency = max_concurrency
+        # At most max_concurrency checks run at once; the rest wait their turn
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def _count(self, text: str, language: str) -> int:
+        raise NotImplementedError
+
+    def check(self, text: str, language: str = "en-US"):
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            print("Grammar API failed:", e)
+            return None
+        try:
+            with self._slots:
+                count = self._count(text[:MAX_TEXT_LENGTH], language)
+        except Exception as e:
+            self.breaker.record_failure()
+            print("Grammar API failed:", e)
+            return None
+        self.breaker.record_success()
+        return count
+
+
+class HTTPLanguageToolBackend(GrammarBackend):
+    """A LanguageTool HTTP server (self-hosted or public), reached through a pooled keep-alive session."""
+
+    def __init__(self, url: str, timeout: float = GRAMMAR_TIMEOUT, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        # requests sessions aren't thread-safe to share, so each thread keeps its own pooled session
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _count(self, text: str, language: str) -> int:
+        response = self._session().post(self.url, data={"text": text, "language": language}, timeout=self.timeout)
+        response.raise_for_status()
+        return len(response.json().get("matches", []))
+
+
+class LocalLanguageToolBackend(GrammarBackend):
+    """An in-process LanguageTool via language-tool-python, started on first use."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._tools = {}
+        self._lock = threading.Lock()
+
+    def _tool(self, language: str):
+        with self._lock:
+            if language not in self._tools:
+                from language_tool_python import LanguageTool
+                self._tools[language] = LanguageTool(language)
+            return self._tools[language]
+
+    def _count(self, text: str, language: str) -> int:
+        tool = self._tool(language)
+        # A LanguageTool instance talks to one local server; serialize calls to it
+        with self._lock:
+            return len(tool.check(text))
+
+
+class NullBackend(GrammarBackend):
+    """Disables grammar checking: every check reports as failed."""
+
+    def check(self, text: str, language: str = "en-US"):
+        return None
+
+
+_backend = None
+
+
+def get_grammar_backend() -> GrammarBackend:
+    """The process-wide grammar backend chosen by RESUME_PARSER_GRAMMAR_BACKEND."""
+    global _backend
+    if _backend is None:
+        if GRAMMAR_BACKEND == "local":
+            _backend = LocalLanguageToolBackend()
+        elif GRAMMAR_BACKEND == "none":
+            _backend = NullBackend()
+        elif LANGUAGETOOL_URL:
+            _backend = HTTPLanguageToolBackend(LANGUAGETOOL_URL)
+        else:
+            print("RESUME_PARSER_GRAMMAR_BACKEND is http but LANGUAGETOOL_URL is not set; grammar checks are disabled")
+            _backend = NullBackend()
+    return _backend
+
+
+def set_grammar_backend(backend: GrammarBackend):
+    global _backend
+    _backend = backend
+
+
+# --- RESULT CACHE ---
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a text for grammar checking: NFC, trimmed lines, single spaces."""
+    text = unicodedata.normalize("NFC", text)
+    lines = (re.sub(r"[ \t]+", " ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def grammar_cache_key(text: str, language: str) -> str:
+    return f"{hashlib.sha256(text.encode('utf-8')).hexdigest()}:{language}"
+
+
+def cached_check(text: str, language: str = "en-US"):
+    """
+    Checks the normalized text, reusing a previous result for the same text and language.
+    Results are cached in memory and on disk with a TTL; failed checks are not cached.
+    """
+    from cache import get_cache
+
+    text = normalize_text(text)[:MAX_TEXT_LENGTH]
+    cache = get_cache("grammar", max_memory_entries=1024, max_bytes=16 * 1024 * 1024, ttl=GRAMMAR_CACHE_TTL)
+    key = grammar_cache_key(text, language)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached["errors"]
+    errors = get_grammar_backend().check(text, language)
+    if errors is not None:
+        cache.put(key, {"errors": errors})
+    return errors
@@ -1,43 +1,55 @@
+import time
+_import_start = time.perf_counter()
+
+import copy
 import re
-import dateutil.parser
-from dateutil.relativedelta import relativedelta
-import nltk
-nltk.download('wordnet')
-from nltk.stem import WordNetLemmatizer
-lemmatizer = WordNetLemmatizer()
-nltk.download('punkt_tab')
-from nltk.tokenize import word_tokenize
-from difflib import SequenceMatcher
-from datetime import datetime
-from dateutil.parser import parse
-from dateutil.relativedelta import relativedelta
-
-def score_resume(resume_data, job_profile):
+from functools import lru_cache
+from datetime import date
+from dates import months_between
+from document import as_document
+from achievements import AchievementClassifier, score_lines
+from resources import get_lemmatizer, record_timing
+from utils import compile_profile
+from grammar import cached_check
+from pipeline import ScoringPipeline, Stage
+from skill_matrix import ProfileMatrix, ResumeMatrix, build_vocabulary, skill_alignment_results
+from title_similarity import get_title_index
+
+def score_resume(resume_data, job_profile, precomputed: dict = None):
     """
     The main, top-level function that orchestrates the entire resume scoring process,
     and returns a comprehensive dictionary with the final score, detailed breakdowns,
-    and individual category scores.
+    and individual category scores. precomputed maps stage names to values already
+    scored elsewhere (see rank_candidates), which are used instead of running them.
     """
     final_score = 0
     final_breakdown = {}
 
+    # Normalize the resume once; every sub-scorer reads from this shared document.
+    # A document can also be passed in directly to reuse its work across job profiles.
+    document = as_document(resume_data)
+
+    # Run every sub-scorer through the scoring graph (see get_scoring_pipeline below):
+    # shared features are computed once and independent stages run concurrently.
+    results, stage_timings = get_scoring_pipeline().run(document, job_profile, precomputed)
+
     # 1. Score Core Impact & Experience (Alignment, Recency, etc.)
-    core_impact_score, core_impact_breakdown = score_alignment(resume_data, job_profile)
+    core_impact_score, core_impact_breakdown = results["core_impact"]
     final_score += core_impact_score
     final_breakdown['core_impact_and_experience'] = core_impact_breakdown
 
     # 2. Score Skill & Technology Alignment
-    skill_score, skill_breakdown = score_skill_alignment(resume_data, job_profile)
+    skill_score, skill_breakdown = results["skill_alignment"]
     final_score += skill_score
     final_breakdown['skill_and_tech_alignment'] = skill_breakdown
 
     # 3. Score Project & Supporting Evidence
-    evidence_score, evidence_breakdown = score_projects_and_evidence(resume_data, job_profile)
+    evidence_score, evidence_breakdown = results["projects_and_evidence"]
     final_score += evidence_score
     final_breakdown['projects_and_evidence'] = evidence_breakdown
 
     # 4. Score Professional Presentation
-    presentation_score, presentation_breakdown = score_professional_presentation(resume_data, job_profile)
+    presentation_score, presentation_breakdown = results["professional_presentation"]
     final_score += presentation_score
     final_breakdown['professional_presentation'] = presentation_breakdown
 
@@ -45,13 +57,90 @@ def score_resume(resume_data, job_profile):
     return {
         "total_score": round(final_score),
         "breakdown": final_breakdown,
-        "parsed_data": resume_data,
+        "parsed_data": dict(document.data),
         "core_impact_score": core_impact_score,
         "skill_alignment_score": skill_score,
         "projects_and_evidence_score": evidence_score,
-        "professional_presentation_score": presentation_score
+        "professional_presentation_score": presentation_score,
+        "stage_timings": stage_timings
     }
 
+@lru_cache(maxsize=None)
+def get_scoring_pipeline():
+    """
+    The scoring graph behind score_resume. Each stage declares the stages it needs;
+    stages marked profile_dependent=False are memoized per resume.
+    """
+    def combine_core_impact(document, job_profile, inputs):
+        breakdown = {}
+        score = 0
+        for name in ("quantifiable_achievements", "experience_relevance", "recency", "total_experience"):
+            stage_score, breakdown[name] = inputs[name]
+            score += stage_score
+        return score, breakdown
+
+    return ScoringPipeline([
+        # I/O-bound, so it starts first and overlaps with the CPU-bound stages
+        Stage("grammar_errors", lambda d, p, i: grammar_check(d.text), profile_dependent=False),
+        Stage("total_years", lambda d, p, i: total_experience_years(d), profile_dependent=False),
+        Stage("quantifiable_achievements", lambda d, p, i: score_quantifiable_achievements(d, p), profile_dependent=False),
+        Stage("experience_relevance", lambda d, p, i: score_experience_relevance(d, p)),
+        Stage("recency", lambda d, p, i: score_recency(d), profile_dependent=False),
+        Stage("total_experience", lambda d, p, i: score_total_experience(d, p, i["total_years"]), requires=["total_years"]),
+        Stage("core_impact", combine_core_impact,
+              requires=["quantifiable_achievements", "experience_relevance", "recency", "total_experience"]),
+        Stage("skill_alignment", lambda d, p, i: score_skill_alignment(d, p)),
+        Stage("projects_and_evidence", lambda d, p, i: score_projects_and_evidence(d, p)),
+        Stage("professional_presentation",
+              lambda d, p, i: score_professional_presentation(d, p, i["grammar_errors"], i["total_years"]),
+              requires=["grammar_errors", "total_years"], profile_dependent=False),
+    ])
+
+def profile_titles(job_profiles) -> list:
+    """The title of every profile in job_profiles ({level: {role: profile}})."""
+    return [compile_profile(job_profile).title for roles in job_profiles.values() for job_profile in roles.values()]
+
+def precompute_features(resume_data, job_profiles=None):
+    """
+    Computes everything about a resume that doesn't depend on the job profile
+    (grammar check, achievements, recency, presentation, online presence and
+    projects, and the experience match for every profile title in job_profiles)
+    and returns the document holding them. Scoring it against any profile then
+    only runs the profile-dependent parts.
+    """
+    document = get_scoring_pipeline().precompute(resume_data)
+    online_presence_and_projects(document)
+    if job_profiles:
+        experience_title_scores(document, profile_titles(job_profiles))
+    return document
+
+def score_resume_all_profiles(resume_data, job_profiles):
+    """
+    Scores one resume against every role in job_profiles ({level: {role: profile}})
+    and returns a role-fit table, best fit first.
+    The resume is normalized once and its profile-independent scores (achievements,
+    recency, online presence, projects, presentation) are computed once; only the
+    profile-dependent parts are re-scored for each role.
+    """
+    document = as_document(resume_data)
+    # Match the experience against every profile title in one batched call
+    experience_title_scores(document, profile_titles(job_profiles))
+    role_fit = []
+    for level, roles in job_profiles.items():
+        for role, job_profile in roles.items():
+            score_data = score_resume(document, job_profile)
+            role_fit.append({
+                "level": level,
+                "role": role,
+                "title": job_profile.get("title", role),
+                "total_score": score_data["total_score"],
+                "core_impact_score": score_data["core_impact_score"],
+                "skill_alignment_score": score_data["skill_alignment_score"],
+                "projects_and_evidence_score": score_data["projects_and_evidence_score"],
+                "professional_presentation_score": score_data["professional_presentation_score"]
+            })
+    return sorted(role_fit, key=lambda x: x["total_score"], reverse=True)
+
 
 
 
@@ -118,6 +207,10 @@ achievement_verbs = [
 recognitions = ["awarded", "recognized", "certified", "nominated", "winner", "top performer", 
                     "appreciated", "honored", "commendation", "employee of the month", "ranked"]
 
+metric_pattern_names = [
+    "percentage", "money", "large_number", "people", "work_items", "increase", "reduction",
+    "cost_saving", "multiplier", "budget", "efficiency", "goal"
+]
 metric_patterns = [
     r'\d+%',  # Percentages
     r'\$\d+(?:,\d{3})*(?:\.\d{2})?[kmb]?',  # Money amounts
@@ -133,9 +226,23 @@ metric_patterns = [
     r'(?:exceeded?|surpassed?|outperformed?)\s+(?:target|goal|quota|benchmark)',  # Goal achievement
 ]
 
-lemmatized_action_verbs = {lemmatizer.lemmatize(v, pos='v') for v in action_verbs}
-lemmatized_achievement_verbs = {lemmatizer.lemmatize(v, pos='v') for v in achievement_verbs}
-lemmatized_recognitions = {lemmatizer.lemmatize(v, pos='v') for v in recognitions}
+# Verbs that show a project had an outcome (action_verbs is a set, so it can't be added to the list directly)
+outcome_verbs = achievement_verbs + sorted(action_verbs)
+
+@lru_cache(maxsize=None)
+def get_achievement_classifier():
+    """
+    Builds the classifier that scores every line of a resume (or a batch of resumes) in one go.
+    Built on first use, since lemmatizing the verb lists needs WordNet to be loaded.
+    """
+    lemmatizer = get_lemmatizer()
+    return AchievementClassifier(
+        lemmatizer,
+        {lemmatizer.lemmatize(v, pos='v') for v in action_verbs},
+        {lemmatizer.lemmatize(v, pos='v') for v in achievement_verbs},
+        {lemmatizer.lemmatize(v, pos='v') for v in recognitions},
+        dict(zip(metric_pattern_names, metric_patterns))
+    )
 
 # function to score alignment
 def score_alignment(resume_data, job_profile):
@@ -145,9 +252,12 @@ def score_alignment(resume_data, job_profile):
     """
     total_alignment_score = 0
     alignment_breakdown = {}
+    resume_data = as_document(resume_data)
 
     # 1. Score Quantifiable Achievements
-    quant_score, quant_breakdown = score_quantifiable_achievements(resume_data, job_profile)
+    quant_score, quant_breakdown = copy.deepcopy(resume_data.memo(
+        "quantifiable_achievements", lambda: score_quantifiable_achievements(resume_data, job_profile)
+    ))
     total_alignment_score += quant_score
     alignment_breakdown['quantifiable_achievements'] = quant_breakdown
 
@@ -158,7 +268,7 @@ def score_alignment(resume_data, job_profile):
     alignment_breakdown['experience_relevance'] = relevance_breakdown
 
     # 3. Score Recency
-    recency_score, recency_breakdown = score_recency(resume_data)
+    recency_score, recency_breakdown = copy.deepcopy(resume_data.memo("recency", lambda: score_recency(resume_data)))
     total_alignment_score += recency_score
     alignment_breakdown['recency'] = recency_breakdown
 
@@ -171,39 +281,31 @@ def score_alignment(resume_data, job_profile):
     return total_alignment_score, alignment_breakdown
 
 
+# function to count total years of experience
+def total_experience_years(resume_data):
+    """Total years of experience across every date range in the resume, computed once per resume."""
+    document = as_document(resume_data)
+
+    def count_years():
+        total_months = 0
+        today = date.today()
+        for date_range in document.date_ranges:
+            total_months += months_between(date_range.start, date_range.end_or(today))
+        # Convert months to years
+        return round(total_months / 12, 1)
+
+    return document.memo("total_years", count_years)
+
+
 # function to score total experience
-def score_total_experience(resume_data, job_profile):
+def score_total_experience(resume_data, job_profile, total_years=None):
     exp_score = 0
     exp_breakdown = {
         "total_relevant_experience": False
     }
-    text = "\n".join(sum(resume_data.values(), []))
-    date_range_pattern = re.findall(
-        r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}\s*(?:–|-|to)\s*(?:Present|(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})",
-        text,
-        re.IGNORECASE
-    )
-
-    total_months = 0
-    for match in re.finditer(
-        r"((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})\s*(–|-|to)\s*((Present)|(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})",
-        text,
-        re.IGNORECASE,
-    ):
-        try:
-            start_str = match.group(1)
-            end_str = match.group(4)
-
-            start = dateutil.parser.parse(start_str)
-            end = dateutil.parser.parse("today") if "present" in end_str.lower() else dateutil.parser.parse(end_str)
-
-            delta = relativedelta(end, start)
-            total_months += delta.years * 12 + delta.months
-        except:
-            continue
-
-    # Convert months to years
-    total_years = round(total_months / 12, 1)
+    if total_years is None:
+        total_years = total_experience_years(resume_data)
+    exp_breakdown["total_years"] = total_years
     min_exp = job_profile.get("min_experience", 0)
 
     if total_years >= min_exp:
@@ -220,65 +322,55 @@ def score_quantifiable_achievements(resume_data, job_profile):
         "quantifiable_achievements": []
     }
     
-    text = "\n".join(sum(resume_data.values(), [])) # join all values of resume_data into a single string
-    lines = text.split("\n")
-    achievement_lines = []
-    for line in lines:
-        clean_line = re.sub(r'[^\w\s]', '', line).lower()
-        clean_line_tokenized = word_tokenize(clean_line)
-        clean_line_lemmatized = [lemmatizer.lemmatize(word) for word in clean_line_tokenized]
-        words_in_line = set(clean_line_lemmatized)
-        metric_found = any(re.search(pattern, line) for pattern in metric_patterns)
-        if not words_in_line.isdisjoint(lemmatized_action_verbs) and not words_in_line.isdisjoint(lemmatized_achievement_verbs) and metric_found and not words_in_line.isdisjoint(lemmatized_recognitions):
-            quant_achievements_score += 20
-            achievement_lines.append(line)
-        elif not words_in_line.isdisjoint(lemmatized_action_verbs) and not words_in_line.isdisjoint(lemmatized_achievement_verbs) and metric_found:
-            quant_achievements_score += 18
-            achievement_lines.append(line)
-        elif not words_in_line.isdisjoint(lemmatized_action_verbs) and not words_in_line.isdisjoint(lemmatized_achievement_verbs):
-            quant_achievements_score += 15
-            achievement_lines.append(line)
-        elif not words_in_line.isdisjoint(lemmatized_achievement_verbs) and metric_found:
-            quant_achievements_score += 12
-            achievement_lines.append(line)
-        elif not words_in_line.isdisjoint(lemmatized_action_verbs) and metric_found:
-            quant_achievements_score += 10
-            achievement_lines.append(line)
-        elif not words_in_line.isdisjoint(lemmatized_action_verbs):
-            quant_achievements_score += 5
-            achievement_lines.append(line)
-        elif not words_in_line.isdisjoint(lemmatized_achievement_verbs):
-            quant_achievements_score += 7
-            achievement_lines.append(line)
-        elif metric_found:
-            quant_achievements_score += 3
-            achievement_lines.append(line)
+    document = as_document(resume_data)
+    lines = document.lines
+    quant_achievements_score, achievement_lines = score_lines(lines, get_achievement_classifier().classify(lines))
     quant_breakdown["quantifiable_achievements"] = achievement_lines
     return quant_achievements_score, quant_breakdown
+
+
+def score_quantifiable_achievements_batch(resumes):
+    """Scores quantifiable achievements for many resumes, classifying all their lines in one go."""
+    documents = [as_document(resume_data) for resume_data in resumes]
+    all_flags = get_achievement_classifier().classify_batch(document.lines for document in documents)
+    results = []
+    for document, flags in zip(documents, all_flags):
+        score, achievement_lines = score_lines(document.lines, flags)
+        results.append((score, {"quantifiable_achievements": achievement_lines}))
+    return results
     
     
+# function to match experience lines against job titles
+def experience_title_scores(resume_data, titles):
+    """
+    The best title similarity (0-10) of any experience line, for each title.
+    All titles are scored in one batched call and remembered on the document, so
+    score_resume_all_profiles can match every profile title at once up front.
+    """
+    document = as_document(resume_data)
+    scores = document.memo("experience_title_scores", dict)
+    missing = tuple(dict.fromkeys(title for title in titles if title not in scores))
+    if missing:
+        lines = document.section_text("work_experience", "experience", lower=True).split("\n")
+        best = get_title_index(missing).best(lines)
+        scores.update((title, float(score) * 10) for title, score in zip(missing, best))
+    return {title: scores[title] for title in titles}
+
+
 # function to score experience relevance
 def score_experience_relevance(resume_data, job_profile):
     relevence_score = 0
     relevence_breakdown = {
         "exp_relevence": False
     }
-    if resume_data.get("experience") or resume_data.get("work_experience") != []:
-        target_job = job_profile.get("title")
-        exp_list1 = resume_data.get("work_experience", []) # Defaults to [] if key is missing
-        exp_list2 = resume_data.get("experience", [])
-        text = "\n".join(exp_list1 + exp_list2)
-        best_score = 0
-        for line in text.split("\n"):
-            current_score = (SequenceMatcher(None, line.lower(), target_job.lower()).ratio())*10
-            if current_score > best_score:
-                best_score = current_score
+    document = as_document(resume_data)
+    if document.get("experience") or document.get("work_experience") != []:
+        target_job = compile_profile(job_profile).title
+        best_score = experience_title_scores(document, [target_job])[target_job]
     else:
-        exp_list1 = resume_data.get("projects", [])
-        exp_list2 = resume_data.get("achievements", [])
-        text = "\n".join(exp_list1 + exp_list2)
+        text = document.section_text("projects", "achievements", lower=True)
         keywords = job_profile.get("keywords", []) +job_profile.get("required_skills", [])
-        matched_keywords = {kw for kw in keywords if kw.lower() in text.lower()}
+        matched_keywords = {kw for kw in keywords if kw.lower() in text}
         best_score = min(len(matched_keywords) * 2, 10)
     exp_relevence_score = best_score
     relevence_breakdown["exp_relevence"] = True
@@ -291,36 +383,27 @@ def score_recency(resume_data):
     recency_breakdown = {
         "recency": []
     }
-    text = "\n".join(sum(resume_data.values(), []))
-    today = datetime.now()
-    date_ranges = re.findall(
-        r"((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})\s*[-–to]+\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}|Present|Current)",
-        text,
-        re.IGNORECASE
-    )
+    today = date.today()
+    date_ranges = as_document(resume_data).date_ranges
 
     if not date_ranges:
-        recency_score = 0 # No dates found, low score.
+        return recency_score, recency_breakdown # No dates found, low score.
 
     # 3. Extract all the end dates from the matches.
-    end_dates_str = [match[1] for match in date_ranges]
+    end_dates_str = [date_range.end_text for date_range in date_ranges]
 
     # 4. Check for the "Present" keyword. If it exists, the resume is current.
-    if any("present" in s.lower() or "current" in s.lower() for s in end_dates_str):
+    if any(date_range.is_present for date_range in date_ranges):
         recency_score += 5 # Full points for being currently employed.
         return recency_score, recency_breakdown
 
-    # 5. If not "Present", parse the date strings into date objects.
-    end_dates = [parse(s) for s in end_dates_str]
-
-    # 6. Find the most recent (latest) date from the list.
-    latest_end_date = max(end_dates)
+    # 5. Find the most recent (latest) end date from the list.
+    latest_end_date = max(date_range.end for date_range in date_ranges)
 
-    # 7. Calculate the gap between today and the last job.
-    gap = relativedelta(today, latest_end_date)
-    gap_in_years = gap.years + (gap.months / 12.0)
+    # 6. Calculate the gap between today and the last job.
+    gap_in_years = months_between(latest_end_date, today) / 12.0
 
-    # 8. Return a score based on the size of the gap.
+    # 7. Return a score based on the size of the gap.
     if gap_in_years <= 1:
         recency_score += 5 # Excellent (less than 1-year gap)
     elif gap_in_years <= 3:
@@ -340,12 +423,14 @@ def score_skill_alignment(resume_data, job_profile):
         "preferred_skills": [],
         "keywords": [],
     }
-    text = "\n".join(sum(resume_data.values(), [])).lower()
-    exp_text = " ".join(resume_data.get("work_experience", []) + resume_data.get("experience", []))
-    project_text = " ".join(resume_data.get("projects", []))
-    content_text = (exp_text + " " + project_text).lower()
+    document = as_document(resume_data)
+    profile = compile_profile(job_profile) # lowercased term lists, computed once per profile
+    text = document.lower_text
+    exp_text = document.section_text("work_experience", "experience", sep=" ", lower=True)
+    project_text = document.section_text("projects", sep=" ", lower=True)
+    content_text = exp_text + " " + project_text
     
-    skill_text = " ".join(resume_data.get("skills", [])).lower()
+    skill_text = document.section_text("skills", sep=" ", lower=True)
     
     all_text = content_text + " " + skill_text
     
@@ -357,48 +442,59 @@ def score_skill_alignment(resume_data, job_profile):
     preferred_found = set()
     keywords_found = set()
     
-    required_skills = job_profile.get("required_skills", [])
+    required_skills = profile.required_skills
     skill_score = 0 
     
     for skill in required_skills:
-        if skill.lower() in content_text and skill.lower() not in master_found_skills:
+        if skill in content_text and skill not in master_found_skills:
             skill_score += 2
-            master_found_skills.add(skill.lower())
-            required_found.add(skill.lower())
-        elif skill.lower() in skill_text and skill.lower() not in master_found_skills:
+            master_found_skills.add(skill)
+            required_found.add(skill)
+        elif skill in skill_text and skill not in master_found_skills:
             skill_score += 1
-            master_found_skills.add(skill.lower())
-            required_found.add(skill.lower())
+            master_found_skills.add(skill)
+            required_found.add(skill)
     total_skill_score = min(skill_score, 15)
             
     skill_alignment_breakdown["skill_usage"] = list(required_found)
     skill_alignment_score += total_skill_score
     
-    preferred_skills = job_profile.get("preferred_skills", [])
+    preferred_skills = profile.preferred_skills
     preferred_skill_score = 0
     
     for skill in preferred_skills:
-        if skill.lower() in all_text and skill.lower() not in master_found_skills:
+        if skill in all_text and skill not in master_found_skills:
             preferred_skill_score += 1
-            master_found_skills.add(skill.lower())
-            preferred_found.add(skill.lower())
+            master_found_skills.add(skill)
+            preferred_found.add(skill)
     total_preferred_skill_score = min(preferred_skill_score, 5)
     skill_alignment_breakdown["preferred_skills"] = list(preferred_found)
     skill_alignment_score += total_preferred_skill_score
           
-    keywords = job_profile.get("keywords", []) + job_profile.get("job_specific_keywords", [])
+    keywords = profile.keywords
     keyword_score = 0
     
     for keyword in keywords:
-        if keyword.lower() in text and keyword.lower() not in master_found_skills:
+        if keyword in text and keyword not in master_found_skills:
             keyword_score += 1
-            master_found_skills.add(keyword.lower())
-            keywords_found.add(keyword.lower())
+            master_found_skills.add(keyword)
+            keywords_found.add(keyword)
     total_keyword_score = min(keyword_score, 10)
     skill_alignment_breakdown["keywords"] = list(keywords_found)
     skill_alignment_score += total_keyword_score
     
     return skill_alignment_score, skill_alignment_breakdown
+
+
+def score_skill_alignment_batch(resumes, job_profile):
+    """
+    Scores skill alignment for many resumes against one profile: each resume is
+    encoded in one pass and all are scored with one matrix product. Returns the
+    same (score, breakdown) as score_skill_alignment, in order.
+    """
+    profiles = [job_profile]
+    vocabulary = build_vocabulary(profiles)
+    return skill_alignment_results(ResumeMatrix(resumes, vocabulary), ProfileMatrix(profiles, vocabulary))
     
 
 def score_projects_and_evidence (resume_data, job_profile):
@@ -411,7 +507,51 @@ def score_projects_and_evidence (resume_data, job_profile):
     
    
 
-    all_text = "\n".join(sum(resume_data.values(), [])).lower()
+    document = as_document(resume_data)
+    # Copied, so each profile's breakdown is its own
+    (final_online_score, found_links), (final_project_score, analyzed_projects) = copy.deepcopy(
+        online_presence_and_projects(document)
+    )
+    content_breakdown["online_presence"] = found_links
+    content_score += final_online_score
+    
+    # Education and Certificates
+    edu_text = document.section_text("education", sep=" ", lower=True)
+    cert_text = document.section_text("certifications", sep=" ", lower=True)
+    edu_cert_score = 0
+    found_edu = False
+    found_cert = False
+    profile = compile_profile(job_profile)
+    for edu in profile.edu_keywords:
+        if edu in edu_text:
+            edu_cert_score += 1
+            found_edu = True
+    
+    for certi in profile.relevant_certs:
+        if certi in cert_text:
+            edu_cert_score += 1
+            found_cert = True
+    final_edu_cert_score = min(edu_cert_score, 5)
+    content_breakdown["education_certificates"] = [found_edu, found_cert]
+    content_score += final_edu_cert_score
+    
+    content_score += final_project_score
+    content_breakdown["projects"] = analyzed_projects
+
+    return content_score, content_breakdown
+    
+def online_presence_and_projects(resume_data):
+    """Online presence and project quality scores; they don't depend on the profile, so are computed once per document."""
+    document = as_document(resume_data)
+    return document.memo(
+        "online_presence_and_projects",
+        lambda: (score_online_presence(document), score_project_quality(document))
+    )
+
+def score_online_presence(resume_data):
+    """Scores LinkedIn/GitHub presence (max 3 points) and returns the links found."""
+    document = as_document(resume_data)
+    all_text = document.lower_text
     # Online Presence  
     online_presence_score = 0
     found_links = {}
@@ -433,32 +573,13 @@ def score_projects_and_evidence (resume_data, job_profile):
     # Cap the score for this section at its max value
     final_online_score = min(online_presence_score, 3)
 
-    content_breakdown["online_presence"] = found_links
-    content_score += final_online_score
-    
-    # Education and Certificates
-    edu_text = " ".join(resume_data.get("education", [])).lower()
-    cert_text = " ".join(resume_data.get("certifications", [])).lower()
-    edu_cert_score = 0
-    found_edu = False
-    found_cert = False
-    keword = job_profile.get("edu_keywords", [])
-    cert = job_profile.get("relevant_certs", [])
-    for edu in keword:
-        if edu.lower() in edu_text:
-            edu_cert_score += 1
-            found_edu = True
-    
-    for certi in cert:
-        if certi.lower() in cert_text:
-            edu_cert_score += 1
-            found_cert = True
-    final_edu_cert_score = min(edu_cert_score, 5)
-    content_breakdown["education_certificates"] = [found_edu, found_cert]
-    content_score += final_edu_cert_score
-    
+    return final_online_score, found_links
+
+def score_project_quality(resume_data):
+    """Scores well-described projects (max 7 points) and returns the per-project analysis."""
+    document = as_document(resume_data)
     # projects
-    projects_list = resume_data.get("projects", [])
+    projects_list = document.section_lines("projects")
     project_score = 0
     analyzed_projects = [] # For the breakdown
 
@@ -478,7 +599,7 @@ def score_projects_and_evidence (resume_data, job_profile):
             project_analysis['has_tech_stack'] = True
 
         # 3. Check for an outcome verb (using our old achievement_verbs list)
-        if any(verb in project.lower() for verb in achievement_verbs + action_verbs):
+        if any(verb in project.lower() for verb in outcome_verbs):
             quality_points += 1
             project_analysis['has_outcome_verb'] = True
 
@@ -490,38 +611,33 @@ def score_projects_and_evidence (resume_data, job_profile):
 
     # Cap the total project score and add it to the main score
     final_project_score = min(project_score, 7)
-    content_score += final_project_score
-    content_breakdown["projects"] = analyzed_projects
-
-    return content_score, content_breakdown
+    return final_project_score, analyzed_projects
     
-import requests
 def grammar_check(text):
-    url = "https://api.languagetool.org/v2/check"
-    data = {
-        'text': text[:2000],  # limit text length
-        'language': 'en-US'
-    }
-    try:
-        response = requests.post(url, data=data)
-        result = response.json()
-        matches = result.get("matches", [])
-        return len(matches)
-    except Exception as e:
-        print("Grammar API failed:", e)
-        return None
+    """
+    Returns the number of grammar/spelling issues in the text, or None if the check failed.
+    The backend (LanguageTool server, local LanguageTool or none) is chosen in grammar.py,
+    and results are cached per unique (normalized) text.
+    """
+    return cached_check(text[:2000], "en-US")  # limit text length
     
+# Stands for "grammar not checked yet", since None already means the check failed
+NOT_CHECKED = object()
+
 # Function to score professional presentation
-def score_professional_presentation(resume_data, job_profile):
+def score_professional_presentation(resume_data, job_profile, grammar_errors=NOT_CHECKED, total_years=None):
     """
     Scores the overall professionalism of the resume based on its formatting,
-    clarity, conciseness, and grammar.
+    clarity, conciseness, and grammar. The scoring pipeline passes in the grammar
+    error count (None if the check failed) and total years it has already computed;
+    called on its own, they are computed here.
     """
     presentation_score = 0
     presentation_breakdown = {}
     
     
-    all_raw_text = "\n".join(sum(resume_data.values(), []))
+    document = as_document(resume_data)
+    all_raw_text = document.text
 
     # --- 1. Clarity & Readability (Max 5 points) ---
     clarity_score = 0
@@ -532,7 +648,7 @@ def score_professional_presentation(resume_data, job_profile):
 
     # Check for key section headers
     headers = ["education", "experience", "skills", "projects"]
-    found_headers = [h for h in headers if h in all_raw_text.lower()]
+    found_headers = [h for h in headers if h in document.lower_text]
     if len(found_headers) >= 3:
         clarity_score += 2
         presentation_breakdown['has_clear_sections'] = True
@@ -541,12 +657,11 @@ def score_professional_presentation(resume_data, job_profile):
 
     # --- 2. Conciseness & Length (Max 5 points) ---
     conciseness_score = 0
-    # First, get the total years of experience from our other function
-    # Note: We only need the breakdown value here, not the score.
-    _, exp_breakdown = score_total_experience(resume_data, job_profile)
-    total_years = exp_breakdown.get("total_years", 0) # Assumes your function provides this
+    # First, get the total years of experience (shared with score_total_experience)
+    if total_years is None:
+        total_years = total_experience_years(document)
     
-    word_count = len(all_raw_text.split())
+    word_count = document.word_count
     presentation_breakdown['word_count'] = word_count
 
     if total_years < 10: # Ideal for 1-page resumes
@@ -563,11 +678,12 @@ def score_professional_presentation(resume_data, job_profile):
     presentation_score += conciseness_score
 
     # --- 3. Grammar & Spelling (Max 5 points) ---
-    from language_tool_python import LanguageTool
     grammar_score = 0
     text = all_raw_text
 
-    errors = grammar_check(text)
+    errors = grammar_errors
+    if errors is NOT_CHECKED:
+        errors = document.memo("grammar_errors", lambda: grammar_check(text))
     if errors is not None:
         presentation_breakdown["grammar_errors"] = errors
         if errors <= 2:
@@ -582,3 +698,5 @@ def score_professional_presentation(resume_data, job_profile):
     presentation_score += grammar_score
     
     return presentation_score, presentation_breakdown
+
+record_timing("import:new_scoring", time.perf_counter() - _import_start)
@@ -0,0 +1,170 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+# OCR runs only on pages whose text layer has fewer than OCR_MIN_CHARS non-space characters
+OCR_ENABLED = os.environ.get("RESUME_PARSER_OCR", "1") != "0"
+OCR_MIN_CHARS = int(os.environ.get("RESUME_PARSER_OCR_MIN_CHARS", "50"))
+# 300 DPI is where Tesseract is most accurate on body-size text; higher mostly costs time
+OCR_DPI = int(os.environ.get("RESUME_PARSER_OCR_DPI", "300"))
+OCR_LANGUAGE = os.environ.get("RESUME_PARSER_OCR_LANGUAGE", "eng")
+OCR_PAGE_TIMEOUT = float(os.environ.get("RESUME_PARSER_OCR_PAGE_TIMEOUT", "30"))
+OCR_WORKERS = int(os.environ.get("RESUME_PARSER_OCR_WORKERS", str(min(os.cpu_count() or 1, 4))))
+
+# Bump whenever rendering, preprocessing or OCR settings change what text a page produces
+OCR_VERSION = "1"
+
+
+def sparse_pages(page_texts, min_chars: int = OCR_MIN_CHARS) -> list:
+    """Indexes of the pages whose text layer is empty or nearly so."""
+    return [index for index, text in enumerate(page_texts) if len("".join(text.split())) < min_chars]
+
+
+def render_pages(source, indexes, dpi: int = OCR_DPI) -> dict:
+    """Renders the given pages to grayscale PNG bytes, {index: png}."""
+    from extractors import get_pdf_engine
+
+    images = {}
+    with get_pdf_engine("pymupdf").open(source) as doc:
+        for index in indexes:
+            pixmap = doc.load_page(index).get_pixmap(dpi=dpi, colorspace="gray")
+            images[index] = pixmap.tobytes("png")
+    return images
+
+
+def preprocess_image(png: bytes):
+    """
+    Cleans up a rendered page for Tesseract: removes speckle noise, binarizes
+    with Otsu's threshold and straightens small skews from scanning.
+    """
+    import cv2
+    import numpy as np
+
+    image = cv2.imdecode(np.frombuffer(png, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    image = cv2.medianBlur(image, 3)
+    _, image = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+    # Estimate the skew from the dark (ink) pixels and rotate it away
+    ink = np.column_stack(np.where(image < 128))
+    if len(ink) > 100:
+        angle = cv2.minAreaRect(ink[:, ::-1].astype(np.float32))[-1]
+        # OpenCV versions disagree on the angle's range; fold it into [-45, 45)
+        angle = (angle + 45) % 90 - 45
+        if 0.1 < abs(angle) < 10:
+            height, width = image.shape
+            matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+            image = cv2.warpAffine(image, matrix, (width, height), flags=cv2.INTER_CUBIC,
+                                   borderMode=cv2.BORDER_CONSTANT, borderValue=255)
+    return image
+
+
+def ocr_image(png: bytes, language: str = OCR_LANGUAGE, timeout: float = OCR_PAGE_TIMEOUT) -> str:
+    """OCRs one rendered page. Tesseract is killed after timeout seconds and the page comes back empty."""
+    import pytesseract
+
+    try:
+        return pytesseract.image_to_string(preprocess_image(png), lang=language, timeout=timeout).strip()
+    except RuntimeError as e:
+        # pytesseract reports its own timeout as a RuntimeError
+        print("OCR failed for a page:", e)
+        return ""
+
+
+_ocr_pool = None
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    global _ocr_pool
+    if _ocr_pool is None:
+        _ocr_pool = ProcessPoolExecutor(max_workers=OCR_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _ocr_pool
+
+
+def _ocr_in_pool(images: dict, language: str, timeout: float, workers: int) -> dict:
+    global _ocr_pool
+    if workers <= 1 or len(images) == 1:
+        return {index: ocr_image(png, language, timeout) for index, png in images.items()}
+    pool = _get_ocr_pool()
+    futures = {index: pool.submit(ocr_image, png, language, timeout) for index, png in images.items()}
+    texts = {}
+    for index, future in futures.items():
+        try:
+            # Tesseract enforces the timeout itself; this only guards against a stuck worker
+            texts[index] = future.result(timeout=timeout + 10)
+        except FutureTimeout:
+            print(f"OCR timed out for page {index + 1}")
+            texts[index] = ""
+        except BrokenProcessPool:
+            print("OCR pool crashed")
+            pool.shutdown(wait=False, cancel_futures=True)
+            _ocr_pool = None
+            break
+    return texts
+
+
+def _source_bytes(source):
+    """The PDF's bytes (or a memoryview of them), reading the file if source is a path."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    return source
+
+
+def ocr_pages(source, indexes, language: str = OCR_LANGUAGE, dpi: int = OCR_DPI,
+              timeout: float = OCR_PAGE_TIMEOUT, workers: int = None) -> dict:
+    """
+    OCRs the given pages of a PDF, returning {index: text}.
+
+    Results are cached by the hash of the PDF and the page number, so a
+    re-uploaded file is neither rendered nor OCR'd again. Pages that miss are
+    rendered here, then OCR'd on a process pool (workers=1 runs them in this
+    process). Pages that fail or time out come back as "" and aren't cached.
+    """
+    import pytesseract
+    from cache import content_key, get_cache
+
+    workers = OCR_WORKERS if workers is None else workers
+    # Fail here, not in a worker, if Tesseract is missing (its error doesn't survive the trip back)
+    pytesseract.get_tesseract_version()
+    cache = get_cache("ocr_pages")
+    # The file is hashed once; each page's key adds its index
+    file_key = content_key(_source_bytes(source), f"{OCR_VERSION}:{dpi}:{language}")
+    keys = {index: f"{file_key}:{index}" for index in indexes}
+
+    texts = {}
+    for index, key in keys.items():
+        cached = cache.get(key)
+        if cached is not None:
+            texts[index] = cached["text"]
+    # Rendering is most of the cost outside Tesseract, so only pages without a cached text are rendered
+    missing = [index for index in indexes if index not in texts]
+    if missing:
+        images = render_pages(source, missing, dpi)
+        for index, text in _ocr_in_pool(images, language, timeout, workers).items():
+            texts[index] = text
+            if text:
+                cache.put(keys[index], {"text": text})
+    return {index: texts.get(index, "") for index in indexes}
+
+
+def fill_sparse_pages(source, page_texts: list, workers: int = None) -> list:
+    """
+    Replaces the text of empty or sparse pages with their OCR text, where OCR
+    finds more. Does nothing if OCR is disabled or Tesseract isn't available.
+    """
+    indexes = sparse_pages(page_texts)
+    if not OCR_ENABLED or not indexes:
+        return page_texts
+    try:
+        ocr_texts = ocr_pages(source, indexes, workers=workers)
+    except Exception as e:
+        # Missing pytesseract/OpenCV or Tesseract binary: keep the text layer as it is
+        print("OCR unavailable:", e)
+        return page_texts
+    page_texts = list(page_texts)
+    for index, text in ocr_texts.items():
+        if len(text.strip()) > len(page_texts[index].strip()):
+            page_texts[index] = text
+    return page_texts
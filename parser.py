@@ -1,17 +1,21 @@
-import pdfplumber
-import os
-from docx import Document
-import spacy
+import time
+_import_start = time.perf_counter()
+
 import re
 import json
-from spacy.matcher import Matcher
+from functools import lru_cache
+from skill_matcher import SkillMatcher
+from dates import find_date_ranges
+from sections import section_lines, split_sections
+from records import Job, Link, ParsedResume
+from resources import get_nlp, record_timing
+from extractors import detect_format, extract_docx_text, extract_pdf_text, read_source
+
+# Bump whenever a change to extraction or parsing changes the output, so cached results are invalidated
+PARSER_VERSION = "7"
 
-# Load a larger spaCy model for better performance, if available
-try:
-    nlp = spacy.load("en_core_web_lg")
-except OSError:
-    print("Large model not found, falling back to small model. For better accuracy, run: python -m spacy download en_core_web_lg")
-    nlp = spacy.load("en_core_web_sm")
+# The spaCy model is loaded lazily by resources.get_nlp() the first time a name is extracted,
+# and the PDF/DOCX libraries are imported only when a file of that type is read.
 
 # --- SKILL LOADING ---
 def load_skills_from_json(file_path: str) -> list:
@@ -34,23 +38,25 @@ def load_skills_from_json(file_path: str) -> list:
 # Load skills from our new JSON file
 all_known_skills = load_skills_from_json("skills.json")
 
+# Compile the skill list once so extraction is a single pass over the text
+skill_matcher = SkillMatcher(all_known_skills)
+
 
 # --- CORE TEXT EXTRACTION ---
 
-def extract_text(file_path: str) -> str:
-    """Extracts raw text from a PDF or DOCX file."""
-    ext = os.path.splitext(file_path)[1].lower()
-    text = ""
-    if ext == ".pdf":
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-    elif ext == ".docx":
-        doc = Document(file_path)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
+def extract_text(source) -> str:
+    """
+    Extracts raw text from a PDF or DOCX file, given as a path, bytes, a memoryview
+    or a file-like object. The format is detected from the content, not the file
+    name, and in-memory files are parsed in memory without a temporary file.
+    """
+    source = read_source(source)
+    file_format = detect_format(source)
+    if file_format == "pdf":
+        # Page by page within the size/page limits, split across processes for long PDFs
+        text = extract_pdf_text(source)
+    elif file_format == "docx":
+        text = extract_docx_text(source)
     else:
         raise ValueError("Unsupported file format: Must be a .pdf or .docx")
     
@@ -70,96 +76,82 @@ def clean_text(text: str) -> str:
 
 # --- STRUCTURED DATA EXTRACTION ---
 
-def parse_resume(text: str) -> dict:
+def parse_resume(text: str) -> ParsedResume:
     """
     Main function to parse the resume text and extract structured data.
-    This is the primary orchestrator.
+    This is the primary orchestrator. The result is a ParsedResume record,
+    which also reads like the dict this used to return.
     """
-    sections = extract_sections(text)
-    
-    # Initialize the data dictionary
-    parsed_data = {
-        "name": None,
-        "email": None,
-        "phone": None,
-        "links": [],
-        "professional_summary": [],
-        "work_experience": [],
-        "education": [],
-        "skills": [],
-        "projects": [],
-        "achievements": [],
-        "certifications": []
-    }
+    parsed_data, header_text = _parse_sections(text)
+    parsed_data.name = extract_name(header_text)
+    return parsed_data
 
+def parse_resumes(texts: list, batch_size: int = 64, n_process: int = 1) -> list:
+    """
+    Parses many resumes at once, returning results in the same order as the texts.
+    Name extraction for the whole batch goes through a single nlp.pipe call.
+    """
+    results = [_parse_sections(text) for text in texts]
+    names = extract_names([header_text for _, header_text in results], batch_size=batch_size, n_process=n_process)
+    for (parsed_data, _), name in zip(results, names):
+        parsed_data.name = name
+    return [parsed_data for parsed_data, _ in results]
+
+def _parse_sections(text: str) -> tuple:
+    """Extracts everything except the name, returning the parsed data and the contact header text."""
+    # One pass over the text finds every section as offsets into it
+    spans = split_sections(text)
+    
     # --- Extracting Contact Info and Name ---
     # We use the text *before* the first section header for contact info
-    first_section_index = text.find(list(sections.keys())[0]) if sections else len(text)
-    header_text = text[:first_section_index]
+    header_text = spans[0].body(text)
 
-    parsed_data["name"] = extract_name(header_text)
-    parsed_data["email"] = extract_email(header_text)
-    parsed_data["phone"] = extract_phone(header_text)
-    parsed_data["links"] = extract_links(header_text)
-    
-    # --- Extracting Content from Sections ---
-    # A recruiter wants to see the summary right away.
-    parsed_data["professional_summary"] = sections.get("professional summary", sections.get("summary", []))
-    
     # The most critical part: structured work experience
-    experience_text = "\n".join(sections.get("work experience", sections.get("experience", [])))
-    parsed_data["work_experience"] = extract_structured_experience(experience_text)
-
-    parsed_data["education"] = sections.get("education", [])
-    parsed_data["projects"] = sections.get("projects", [])
-    parsed_data["achievements"] = sections.get("achievements", [])
-    parsed_data["certifications"] = sections.get("certifications", [])
-    
+    experience_text = "\n".join(section_lines(text, spans, "work_experience"))
     # Extract skills using the known list and context
     # This now uses the skills loaded from skills.json
-    skills_section_text = "\n".join(sections.get("skills", sections.get("technical skills", [])))
-    parsed_data["skills"] = extract_skills(skills_section_text, all_known_skills)
+    skills_section_text = "\n".join(section_lines(text, spans, "skills"))
 
-    return parsed_data
+    parsed_data = ParsedResume(
+        email=extract_email(header_text),
+        phone=extract_phone(header_text),
+        links=extract_links(header_text),
+        # A recruiter wants to see the summary right away.
+        professional_summary=section_lines(text, spans, "professional_summary"),
+        work_experience=extract_structured_experience(experience_text),
+        education=section_lines(text, spans, "education"),
+        skills=extract_skills(skills_section_text, all_known_skills),
+        projects=section_lines(text, spans, "projects"),
+        achievements=section_lines(text, spans, "achievements"),
+        certifications=section_lines(text, spans, "certifications"),
+    )
 
-def extract_sections(text: str) -> dict:
+    return parsed_data, header_text
 
-    section_headers = [
-        "professional summary", "summary", "objective",
-        "work experience", "experience", "employment history",
-        "education",
-        "skills", "technical skills",
-        "projects",
-        "achievements", "awards",
-        "certifications", "licenses & certifications"
-    ]
-    
+def extract_sections(text: str) -> dict:
+    """
+    Groups the resume's lines by canonical section name ("work_experience",
+    "skills", ...), with the lines above the first heading under "header".
+    See sections.SectionSplitter for what counts as a heading.
+    """
     sections = {}
-    current_section = "header" # Start in a default 'header' section
-    sections[current_section] = []
-
-    for line in text.split('\n'):
-        line_lower = line.lower().strip()
-
-        # Check if the line is a header
-        is_header = False
-        for header in section_headers:
-            # A header is a line that contains the header text, and is usually short.
-            if header in line_lower and len(line_lower) < 30:
-                current_section = header
-                if current_section not in sections:
-                    sections[current_section] = []
-                is_header = True
-                break
-        
-        if not is_header and line.strip():
-            sections[current_section].append(line.strip())
-            
+    for section in split_sections(text):
+        sections.setdefault(section.name, []).extend(section.lines(text))
     return sections
 
 def extract_name(text: str) -> str:
     """Extracts the candidate's name using spaCy's NER and regex fallbacks."""
-    doc = nlp(text)
+    return _name_from_doc(get_nlp()(text), text)
+
+def extract_names(texts: list, batch_size: int = 64, n_process: int = 1) -> list:
+    """
+    Batch version of extract_name. Runs all the header texts through nlp.pipe with
+    the shared model and returns the names in the original order.
+    """
+    docs = get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [_name_from_doc(doc, text) for doc, text in zip(docs, texts)]
+
+def _name_from_doc(doc, text: str) -> str:
     for ent in doc.ents:
         if ent.label_ == "PERSON":
             return ent.text.strip()
@@ -192,7 +184,7 @@ def extract_links(text: str) -> list:
     for link_type, pattern in patterns.items():
         matches = re.findall(pattern, text, re.IGNORECASE)
         for match in matches:
-            links.append({"type": link_type, "url": match})
+            links.append(Link(link_type, match))
     return links
     
 def extract_structured_experience(text: str) -> list:
@@ -201,35 +193,52 @@ def extract_structured_experience(text: str) -> list:
     parses out the title, company, dates, and description.
     """
     experience = []
+    # Date ranges are the most reliable anchors; index them once for the whole section
+    date_ranges = find_date_ranges(text)
+
     # Split the text into chunks that likely represent a single job
-    job_chunks = re.split(r'\n(?=[A-Z][a-z\s]+)', text) # Split on lines that look like job titles
+    # (on lines that look like job titles), keeping each chunk's offsets
+    splits = list(re.finditer(r'\n(?=[A-Z][a-z\s]+)', text))
+    chunk_starts = [0] + [m.end() for m in splits]
+    chunk_ends = [m.start() for m in splits] + [len(text)]
 
-    for chunk in job_chunks:
+    range_index = 0
+    for chunk_start, chunk_end in zip(chunk_starts, chunk_ends):
+        chunk = text[chunk_start:chunk_end]
         if not chunk.strip():
             continue
-            
-        job = {}
-        # Date patterns are the most reliable anchors
-        date_match = re.search(r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4})\s*[-–to]+\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}|Present|Current)', chunk, re.IGNORECASE)
-        
-        if date_match:
-            job['start_date'] = date_match.group(1)
-            job['end_date'] = date_match.group(2)
+
+        # The first date range that lies entirely inside this chunk
+        while range_index < len(date_ranges) and date_ranges[range_index].endpos <= chunk_start:
+            range_index += 1
+        date_range = date_ranges[range_index] if range_index < len(date_ranges) else None
+        if date_range and date_range.pos >= chunk_end:
+            date_range = None
+        elif date_range and (date_range.pos < chunk_start or date_range.endpos > chunk_end):
+            # A range running across a job split can hide this chunk's own dates; search the chunk alone
+            local_ranges = find_date_ranges(chunk)
+            date_range = local_ranges[0]._replace(
+                pos=local_ranges[0].pos + chunk_start, endpos=local_ranges[0].endpos + chunk_start
+            ) if local_ranges else None
+
+        if date_range:
             # The text before the date is likely title and company
-            header_part = chunk[:date_match.start()].strip()
+            header_part = text[chunk_start:date_range.pos].strip()
             # The text after is the description
-            job['description'] = chunk[date_match.end():].strip().split('\n')
+            description = text[date_range.endpos:chunk_end].strip().split('\n')
             
             # Try to split the header into Title and Company
             header_lines = header_part.split('\n')
-            job['title'] = header_lines[0].strip()
-            job['company'] = header_lines[1].strip() if len(header_lines) > 1 else None
+            job = Job(
+                title=header_lines[0].strip(),
+                company=header_lines[1].strip() if len(header_lines) > 1 else None,
+                start_date=date_range.start_text,
+                end_date=date_range.end_text,
+                description=description,
+            )
         else:
             # If no date is found, we can't structure it reliably
-            job['title'] = None
-            job['company'] = None
-            job['dates'] = None
-            job['description'] = chunk.strip().split('\n')
+            job = Job(description=chunk.strip().split('\n'))
             
         experience.append(job)
         
@@ -238,11 +247,21 @@ def extract_structured_experience(text: str) -> list:
 # --- SKILL EXTRACTION ---
 
 def extract_skills(text: str, known_skills: list) -> list:
-    """Finds skills from a known list using robust regex matching."""
-    found_skills = set()
-    for skill in known_skills:
-        # Use word boundaries to match whole words only (e.g., "Java" not "JavaScript")
-        pattern = r"\b" + re.escape(skill) + r"\b"
-        if re.search(pattern, text, re.IGNORECASE):
-            found_skills.add(skill)
-    return sorted(list(found_skills))
+    """Finds skills from a known list, matching whole words only (e.g., "Java" not "JavaScript")."""
+    return get_skill_matcher(known_skills).extract(text)
+
+def find_skill_matches(text: str, known_skills: list = None) -> list:
+    """Returns (start, end, skill) offsets for every known skill found in the text."""
+    return get_skill_matcher(known_skills).find_matches(text)
+
+def get_skill_matcher(known_skills: list = None) -> SkillMatcher:
+    """Returns the startup matcher for the default skills, or a cached one for a custom list."""
+    if known_skills is None or known_skills is all_known_skills:
+        return skill_matcher
+    return _build_skill_matcher(tuple(known_skills))
+
+@lru_cache(maxsize=32)
+def _build_skill_matcher(known_skills: tuple) -> SkillMatcher:
+    return SkillMatcher(known_skills)
+
+record_timing("import:parser", time.perf_counter() - _import_start)
@@ -0,0 +1,97 @@
+import copy
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from document import as_document
+
+
+class Stage:
+    """
+    One step of a scoring pipeline.
+
+    func(document, job_profile, inputs) computes the stage's value, where inputs
+    maps each name in requires to that stage's value. Stages that don't depend on
+    the job profile are memoized on the document under the stage's name, so they
+    run once per resume however many profiles it is scored against; each run
+    returns a copy of the memoized value.
+    """
+
+    def __init__(self, name: str, func, requires=(), profile_dependent: bool = True):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.profile_dependent = profile_dependent
+
+    def run(self, document, job_profile, inputs):
+        if self.profile_dependent:
+            return self.func(document, job_profile, inputs)
+        # Each call gets its own copy, so one profile's result can be edited without changing another's
+        return copy.deepcopy(document.memo(self.name, lambda: self.func(document, job_profile, inputs)))
+
+
+class ScoringPipeline:
+    """
+    Runs a set of stages as a dependency graph.
+
+    Every stage starts as soon as the stages it requires have finished, so
+    independent stages -- in particular the I/O-bound grammar check -- run
+    concurrently on a shared thread pool. Each stage runs exactly once per call
+    and its wall-clock time is reported in milliseconds.
+    """
+
+    def __init__(self, stages, max_workers: int = 4):
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in stages:
+            missing = [name for name in stage.requires if name not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' requires unknown stages: {missing}")
+        self.max_workers = max_workers
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scoring")
+        return self._executor
+
+    def _timed(self, stage, document, job_profile, inputs):
+        start = time.perf_counter()
+        value = stage.run(document, job_profile, inputs)
+        return value, round((time.perf_counter() - start) * 1000, 2)
+
+    def run(self, resume_data, job_profile, precomputed: dict = None) -> tuple:
+        """
+        Returns ({stage name: value}, {stage name: milliseconds}). Stages whose values
+        are given in precomputed (e.g. scored for many resumes at once) are not run.
+        """
+        results = dict(precomputed or {})
+        timings = {name: 0.0 for name in results}
+        pending = {name: stage for name, stage in self.stages.items() if name not in results}
+        self._run_stages(pending, as_document(resume_data), job_profile, results, timings)
+        return results, timings
+
+    def precompute(self, resume_data):
+        """
+        Runs every profile-independent stage now, memoizing the values on the document,
+        e.g. in a worker process before the document is sent back to be scored.
+        """
+        document = as_document(resume_data)
+        stages = {name: stage for name, stage in self.stages.items() if not stage.profile_dependent}
+        self._run_stages(stages, document, None, {}, {})
+        return document
+
+    def _run_stages(self, pending: dict, document, job_profile, results: dict, timings: dict):
+        executor = self._get_executor()
+        pending = dict(pending)
+        running = {}
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.requires):
+                    inputs = {dep: results[dep] for dep in stage.requires}
+                    running[executor.submit(self._timed, stage, document, job_profile, inputs)] = name
+                    del pending[name]
+            if not running:
+                raise ValueError(f"Stages with circular or missing requirements: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name], timings[name] = future.result()
@@ -0,0 +1,204 @@
+import marshal
+import sys
+from collections.abc import Mapping
+
+# First byte of every packed record; bump when the tuple layout below changes
+FORMAT_VERSION = 1
+# marshal's output is only guaranteed to round-trip on the same Python version,
+# so anything persisted in packed form should be keyed by this
+RECORD_VERSION = f"{FORMAT_VERSION}:py{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+def pack(value) -> bytes:
+    """Serializes nested tuples/lists of str, int, float, bool and None into compact bytes."""
+    return bytes([FORMAT_VERSION]) + marshal.dumps(value)
+
+
+def unpack(data):
+    """Reverses pack(). Raises ValueError for data written by a different format version."""
+    data = memoryview(data)
+    if not len(data) or data[0] != FORMAT_VERSION:
+        raise ValueError("Packed record has an unknown format version")
+    return marshal.loads(data[1:])
+
+
+class Record(Mapping):
+    """
+    Base for the slotted parse records below.
+
+    Each record also reads like the dict the parser used to return
+    (record["title"], record.get("links"), dict(record)), so code written
+    against those dicts keeps working. Values are converted to plain lists and
+    dicts as they are read; to_dict() builds the full dict at once.
+    """
+
+    __slots__ = ()
+    _keys = ()
+
+    def _value(self, key):
+        return getattr(self, key)
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._value(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def to_dict(self) -> dict:
+        return {key: self._value(key) for key in self._keys}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # Pickle as the compact tuple form, e.g. when results cross process boundaries
+        return type(self).from_tuple, (self.to_tuple(),)
+
+    def to_bytes(self) -> bytes:
+        return pack(self.to_tuple())
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls.from_tuple(unpack(data))
+
+
+class Link(Record):
+    """A profile or portfolio link from the contact header."""
+
+    __slots__ = ("type", "url")
+    _keys = ("type", "url")
+
+    def __init__(self, type: str, url: str):
+        self.type = type
+        self.url = url
+
+    def to_tuple(self) -> tuple:
+        return (self.type, self.url)
+
+    @classmethod
+    def from_tuple(cls, values):
+        link = cls.__new__(cls)
+        link.type, link.url = values
+        return link
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, Link):
+            return data
+        return cls(data.get("type"), data.get("url"))
+
+
+class Job(Record):
+    """
+    One entry of the work experience section.
+    Jobs without a recognizable date range have no start/end date; their dict
+    view has "dates": None instead, as before.
+    """
+
+    __slots__ = ("title", "company", "start_date", "end_date", "description")
+
+    def __init__(self, title: str = None, company: str = None, start_date: str = None, end_date: str = None,
+                 description=()):
+        self.title = title
+        self.company = company
+        self.start_date = start_date
+        self.end_date = end_date
+        self.description = tuple(description)
+
+    @property
+    def _keys(self):
+        # The key order of the old dicts, which is also the order their text is read in
+        if self.start_date is not None:
+            return ("start_date", "end_date", "description", "title", "company")
+        return ("title", "company", "dates", "description")
+
+    def _value(self, key):
+        if key == "dates":
+            return None
+        if key == "description":
+            return list(self.description)
+        return getattr(self, key)
+
+    def to_tuple(self) -> tuple:
+        return (self.title, self.company, self.start_date, self.end_date, self.description)
+
+    @classmethod
+    def from_tuple(cls, values):
+        job = cls.__new__(cls)
+        job.title, job.company, job.start_date, job.end_date, job.description = values
+        return job
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, Job):
+            return data
+        return cls(data.get("title"), data.get("company"), data.get("start_date"), data.get("end_date"),
+                   data.get("description") or ())
+
+
+class ParsedResume(Record):
+    """
+    Everything parse_resume extracts from one resume.
+
+    List fields are stored as tuples, links and jobs as Link and Job records.
+    to_bytes()/from_bytes() give a compact binary form for caches, and pickling
+    uses the same tuple layout, so records are cheap to hold in bulk and to send
+    between processes.
+    """
+
+    __slots__ = ("name", "email", "phone", "links", "professional_summary", "work_experience",
+                 "education", "skills", "projects", "achievements", "certifications")
+    _keys = __slots__
+    _line_fields = ("professional_summary", "education", "skills", "projects", "achievements", "certifications")
+
+    def __init__(self, name: str = None, email: str = None, phone: str = None, links=(), professional_summary=(),
+                 work_experience=(), education=(), skills=(), projects=(), achievements=(), certifications=()):
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.links = tuple(Link.from_dict(link) for link in links)
+        self.professional_summary = tuple(professional_summary)
+        self.work_experience = tuple(Job.from_dict(job) for job in work_experience)
+        self.education = tuple(education)
+        self.skills = tuple(skills)
+        self.projects = tuple(projects)
+        self.achievements = tuple(achievements)
+        self.certifications = tuple(certifications)
+
+    def _value(self, key):
+        value = getattr(self, key)
+        if key in ("links", "work_experience"):
+            return [record.to_dict() for record in value]
+        if key in self._line_fields:
+            return list(value)
+        return value
+
+    def to_tuple(self) -> tuple:
+        return (self.name, self.email, self.phone,
+                tuple(link.to_tuple() for link in self.links),
+                self.professional_summary,
+                tuple(job.to_tuple() for job in self.work_experience),
+                self.education, self.skills, self.projects, self.achievements, self.certifications)
+
+    @classmethod
+    def from_tuple(cls, values):
+        # Skips __init__: the tuple form already holds tuples, so only links and jobs need building
+        parsed = cls.__new__(cls)
+        (parsed.name, parsed.email, parsed.phone, links, parsed.professional_summary, jobs,
+         parsed.education, parsed.skills, parsed.projects, parsed.achievements, parsed.certifications) = values
+        parsed.links = tuple(Link.from_tuple(link) for link in links)
+        parsed.work_experience = tuple(Job.from_tuple(job) for job in jobs)
+        return parsed
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a record from a parse_resume-style dict (or returns it if it already is one)."""
+        if isinstance(data, ParsedResume):
+            return data
+        return cls(**{key: data.get(key) or () for key in cls._line_fields + ("links", "work_experience")},
+                   name=data.get("name"), email=data.get("email"), phone=data.get("phone"))
@@ -0,0 +1,116 @@
+# Lazy, offline-first loading of the NLP resources used by the parser and scorer.
+# Nothing here touches the network or loads a model at import time: each resource
+# is found on local disk and loaded on first use, and the time spent importing
+# modules and loading each resource is recorded in `timings`. Missing NLTK data
+# (the dev container installs it) is an error naming the package to install,
+# unless downloads are explicitly allowed.
+import os
+import threading
+import time
+
+# Set RESUME_PARSER_ALLOW_DOWNLOADS=1 to fetch missing NLTK data on first use instead of failing
+ALLOW_DOWNLOADS = os.environ.get("RESUME_PARSER_ALLOW_DOWNLOADS", "0") == "1"
+
+# Only named entity recognition is needed to find the candidate's name. The shared
+# tok2vec is dropped too once loaded, unless the model's NER listens to it (see _load_spacy_model).
+SPACY_MODELS = ["en_core_web_lg", "en_core_web_sm"]
+SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+NLTK_RESOURCES = {
+    "wordnet": "corpora/wordnet",
+}
+
+timings = {}
+_resources = {}
+_lock = threading.Lock()
+
+
+def record_timing(name: str, seconds: float):
+    timings[name] = round(seconds * 1000, 2)
+
+
+def report_timings() -> dict:
+    """Returns the recorded import and load latencies in milliseconds."""
+    return dict(timings)
+
+
+def _load_once(name: str, loader):
+    resource = _resources.get(name)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(name)
+            if resource is None:
+                start = time.perf_counter()
+                resource = loader()
+                record_timing(f"load:{name}", time.perf_counter() - start)
+                _resources[name] = resource
+    return resource
+
+
+def ensure_nltk_data(name: str):
+    """
+    Checks that an NLTK resource is installed locally. A missing resource raises
+    LookupError naming the package to install; with RESUME_PARSER_ALLOW_DOWNLOADS=1
+    it is downloaded once instead.
+    """
+    import nltk
+    try:
+        nltk.data.find(NLTK_RESOURCES[name])
+        return
+    except LookupError:
+        pass
+    if ALLOW_DOWNLOADS:
+        print(f"NLTK resource '{name}' not found, downloading it")
+        if nltk.download(name, quiet=True):
+            return
+    raise LookupError(
+        f"NLTK data package '{name}' is not installed. Install it with: python -m nltk.downloader {name} "
+        f"(or set RESUME_PARSER_ALLOW_DOWNLOADS=1 to download it on first use)"
+    )
+
+
+def _load_spacy_model():
+    import spacy
+    for model_name in SPACY_MODELS:
+        try:
+            nlp = spacy.load(model_name, exclude=SPACY_EXCLUDE)
+        except OSError:
+            print(f"spaCy model {model_name} not found. Install it with: python -m spacy download {model_name}")
+            continue
+        return _drop_unused_tok2vec(nlp)
+    raise OSError("No spaCy English model is installed.")
+
+
+def _drop_unused_tok2vec(nlp):
+    """
+    Removes the shared tok2vec if no remaining component listens to it. The en_core_web
+    models give NER its own embedding layer, so tok2vec only feeds the excluded
+    tagger/parser; a model whose NER does listen to it keeps it.
+    """
+    if "tok2vec" in nlp.pipe_names and not getattr(nlp.get_pipe("tok2vec"), "listening_components", None):
+        nlp.remove_pipe("tok2vec")
+    return nlp
+
+
+def _load_lemmatizer():
+    ensure_nltk_data("wordnet")
+    from nltk.stem import WordNetLemmatizer
+    lemmatizer = WordNetLemmatizer()
+    lemmatizer.lemmatize("warmup")  # WordNet itself is read lazily on the first lookup
+    return lemmatizer
+
+
+def get_nlp():
+    """The shared spaCy pipeline, loaded with only the components name extraction needs."""
+    return _load_once("spacy", _load_spacy_model)
+
+
+def get_lemmatizer():
+    """The shared WordNet lemmatizer."""
+    return _load_once("wordnet", _load_lemmatizer)
+
+
+def warm_up():
+    """Loads every resource up front, e.g. in a worker process before it takes jobs."""
+    get_nlp()
+    get_lemmatizer()
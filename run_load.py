@@ -0,0 +1,106 @@
+"""
+Load-tests a running service.py: submits resumes at a fixed concurrency, polls
+each job to completion and reports throughput and latency percentiles.
+
+Each client submits a file, long-polls its job until it finishes, then moves on
+to the next file. Latency is measured from the first submit attempt to the
+finished result, so it includes time spent queued and retrying after a 429
+(which are counted separately).
+
+    python run_load.py http://localhost:8080 resumes/ --concurrency 16 --requests 200
+    python run_load.py http://localhost:8080 resumes.zip --endpoint parse --concurrency 64
+"""
+import argparse
+import asyncio
+import itertools
+import time
+from collections import Counter
+
+import aiohttp
+
+from score_batch import iter_resume_files, latency_percentiles
+
+
+async def run_one(session: aiohttp.ClientSession, base_url: str, endpoint: str, params: dict,
+                  name: str, data: bytes, stats: dict):
+    start = time.perf_counter()
+    while True:
+        form = aiohttp.FormData()
+        form.add_field("file", data, filename=name)
+        async with session.post(f"{base_url}/{endpoint}", data=form, params=params) as response:
+            if response.status == 429:
+                stats["rejected"] += 1
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+                continue
+            body = await response.json()
+            if response.status != 202:
+                stats["failed"] += 1
+                stats["errors"].append(body.get("error", response.status))
+                return
+            break
+
+    while True:
+        async with session.get(f"{base_url}{body['status_url']}", params={"wait": "30"}) as response:
+            job = await response.json()
+        if job.get("status") in ("done", "failed"):
+            break
+        if response.status != 200:
+            stats["failed"] += 1
+            stats["errors"].append(job.get("error", response.status))
+            return
+    stats["latencies"].append(time.perf_counter() - start)
+    if job["status"] == "failed":
+        stats["failed"] += 1
+        stats["errors"].append(job.get("error"))
+    else:
+        stats["succeeded"] += 1
+
+
+async def load_test(base_url: str, files: list, endpoint: str, params: dict, concurrency: int, requests: int) -> dict:
+    stats = {"succeeded": 0, "failed": 0, "rejected": 0, "latencies": [], "errors": []}
+    work = iter(itertools.islice(itertools.cycle(files), requests))
+
+    async def client(session):
+        for name, data in work:
+            await run_one(session, base_url, endpoint, params, name, data, stats)
+
+    timeout = aiohttp.ClientTimeout(total=None)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("url", help="base URL of the service, e.g. http://localhost:8080")
+    arg_parser.add_argument("inputs", nargs="+", help="directories, archives or PDF/DOCX files to send (reused in a cycle)")
+    arg_parser.add_argument("--endpoint", choices=["parse", "score"], default="score")
+    arg_parser.add_argument("--level", default="Intern", help="profile level for /score")
+    arg_parser.add_argument("--role", default="Data Analyst", help="profile role for /score")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="clients submitting at once")
+    arg_parser.add_argument("--requests", type=int, default=100, help="total files to submit")
+    args = arg_parser.parse_args()
+
+    files = [(name.rsplit("/", 1)[-1], read()) for path in args.inputs for name, read in iter_resume_files(path)]
+    if not files:
+        arg_parser.error("No PDF or DOCX files found in the inputs")
+    params = {"level": args.level, "role": args.role} if args.endpoint == "score" else {}
+
+    stats = asyncio.run(load_test(args.url.rstrip("/"), files, args.endpoint, params, args.concurrency, args.requests))
+
+    completed = stats["succeeded"] + stats["failed"]
+    print(f"{completed} requests to /{args.endpoint} at concurrency {args.concurrency} in {stats['elapsed']:.1f}s")
+    print(f"Throughput: {completed / stats['elapsed']:.2f} requests/s "
+          f"({stats['succeeded']} succeeded, {stats['failed']} failed, {stats['rejected']} 429 responses)")
+    latencies = latency_percentiles(stats["latencies"], percentiles=(50, 95, 99))
+    if latencies:
+        print("Latency (ms): " + "  ".join(f"{name} {value:.0f}" for name, value in latencies.items()))
+    for error, count in Counter(map(str, stats["errors"])).most_common(5):
+        print(f"  {count} x {error}")
+
+
+if __name__ == "__main__":
+    main()
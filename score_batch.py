@@ -0,0 +1,280 @@
+"""
+Scores a directory or archive of resumes against one job profile, without the UI.
+
+Every .pdf and .docx file under the inputs (directories are walked recursively;
+.zip, .tar, .tar.gz and .tgz archives are read in place) is extracted, parsed
+and scored on a pool of worker processes. Results are appended to the output as
+each file finishes: JSON lines for .jsonl, one row per file for .csv.
+
+Progress is recorded in a checkpoint file next to the output. If a run is
+interrupted, run the same command again: files already written are skipped and
+new results are appended. Files that crashed their worker or timed out are not
+marked done, so the next run tries them again and appends a new row for them
+(the later row for a file supersedes the earlier one). --restart throws the
+previous results away.
+
+    python score_batch.py resumes/ --level Intern --role "Data Analyst" -o results.jsonl
+    python score_batch.py batch1.zip batch2.tar.gz --level Intern --role "Data Analyst" -o results.csv
+"""
+import argparse
+import csv
+import json
+import os
+import statistics
+import tarfile
+import time
+import zipfile
+
+from batch import DEFAULT_TIMEOUT, BatchEvaluator
+from utils import get_profile_index
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
+
+# The score columns of a CSV row; JSON lines also carry them
+SCORE_FIELDS = ["score", "core_impact_score", "skill_alignment_score", "projects_and_evidence_score",
+                "professional_presentation_score"]
+CSV_FIELDS = ["name"] + SCORE_FIELDS + ["seconds", "error"]
+
+
+# --- INPUT ---
+
+def _is_resume(name: str) -> bool:
+    base = os.path.basename(name)
+    # Skips the "._name.pdf" and __MACOSX/ metadata entries macOS adds to archives
+    return (base.lower().endswith(RESUME_EXTENSIONS) and not base.startswith(".")
+            and "__MACOSX" not in name.split("/"))
+
+
+def iter_resume_files(path: str):
+    """
+    Yields (name, read) for every resume under path, where read() returns the
+    file's bytes. Nothing is read until read() is called, so files a resumed run
+    skips are never opened.
+    """
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                if _is_resume(file_path):
+                    yield file_path, lambda file_path=file_path: _read_file(file_path)
+    elif path.lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_resume(info.filename):
+                    yield os.path.join(path, info.filename), lambda info=info: archive.read(info)
+    elif path.lower().endswith(ARCHIVE_EXTENSIONS):
+        with tarfile.open(path) as archive:
+            for member in archive:
+                if member.isfile() and _is_resume(member.name):
+                    yield os.path.join(path, member.name), lambda member=member: archive.extractfile(member).read()
+    elif _is_resume(path):
+        yield path, lambda: _read_file(path)
+    else:
+        print(f"Skipping {path}: not a directory, archive, PDF or DOCX file")
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# --- OUTPUT ---
+
+def result_row(result: dict, details: bool = False) -> dict:
+    """The output row for one evaluate_file result."""
+    row = {"name": result["name"]}
+    if "error" in result:
+        row["error"] = result["error"]
+    else:
+        score_data = result["details"]
+        row["score"] = result["score"]
+        for field in SCORE_FIELDS[1:]:
+            row[field] = score_data[field]
+        if details:
+            row["breakdown"] = score_data["breakdown"]
+            row["parsed_data"] = score_data["parsed_data"]
+    row["seconds"] = round(result.get("seconds", 0.0), 4)
+    return row
+
+
+class JSONLWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, row: dict):
+        self.f.write(json.dumps(row, default=str) + "\n")
+        self.f.flush()
+
+
+class CSVWriter:
+    def __init__(self, f, write_header: bool):
+        self.f = f
+        self.writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        if write_header:
+            self.writer.writeheader()
+
+    def write(self, row: dict):
+        self.writer.writerow(row)
+        self.f.flush()
+
+
+# --- CHECKPOINT ---
+
+class Checkpoint:
+    """
+    The names of the files whose results are already in the output, one JSON
+    string per line after a header line describing the run. A name is appended
+    only after its row has been written and flushed.
+    """
+
+    def __init__(self, path: str, run: dict):
+        self.path = path
+        self.run = run
+        self.done = set()
+        self.f = None
+
+    def load(self) -> bool:
+        """Reads an existing checkpoint; False if there is none. Raises ValueError if it is for a different run."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            lines = f.read().split("\n")
+        if json.loads(lines[0]) != self.run:
+            raise ValueError(f"{self.path} was written for a different run ({lines[0]}); use --restart to start over")
+        # A final line cut off mid-write is ignored; that file is simply scored again
+        self.done = {json.loads(line) for line in lines[1:-1]}
+        return True
+
+    def open(self, fresh: bool):
+        self.f = open(self.path, "w" if fresh else "a")
+        if fresh:
+            self.f.write(json.dumps(self.run) + "\n")
+            self.f.flush()
+
+    def add(self, name: str):
+        self.done.add(name)
+        self.f.write(json.dumps(name) + "\n")
+        self.f.flush()
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+
+
+def _truncate_partial_line(path: str):
+    """Drops an incomplete last row left behind by a run that was killed mid-write."""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+# --- REPORT ---
+
+def latency_percentiles(seconds, percentiles=(50, 90, 95, 99)) -> dict:
+    """{"p50": ..., ...} in milliseconds, plus "max"; empty if there are no samples."""
+    if not seconds:
+        return {}
+    if len(seconds) == 1:
+        cuts = [seconds[0]] * 99
+    else:
+        cuts = statistics.quantiles(seconds, n=100, method="inclusive")
+    summary = {f"p{p}": cuts[p - 1] * 1000 for p in percentiles}
+    summary["max"] = max(seconds) * 1000
+    return summary
+
+
+def print_report(succeeded: int, failed: int, skipped: int, seconds: list, elapsed: float):
+    processed = succeeded + failed
+    print(f"\n{processed} files in {elapsed:.1f}s ({processed / elapsed if elapsed else 0:.2f} files/s): "
+          f"{succeeded} scored, {failed} failed, {skipped} skipped (already done)")
+    latencies = latency_percentiles(seconds)
+    if latencies:
+        print("Per-file latency (ms): " + "  ".join(f"{name} {value:.0f}" for name, value in latencies.items()))
+
+
+# --- MAIN ---
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("inputs", nargs="+", help="directories, archives or individual PDF/DOCX files")
+    arg_parser.add_argument("-o", "--output", required=True, help="results file, .jsonl or .csv")
+    arg_parser.add_argument("--level", required=True, help="candidate level in the profiles file, e.g. Intern")
+    arg_parser.add_argument("--role", required=True, help="job role under that level, e.g. 'Data Analyst'")
+    arg_parser.add_argument("--profiles", default="job_profile.json", help="job profiles file")
+    arg_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    arg_parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="per-file time limit in seconds")
+    arg_parser.add_argument("--details", action="store_true", help="include the score breakdown and parsed resume in JSON lines")
+    arg_parser.add_argument("--checkpoint", help="checkpoint file (default: OUTPUT.checkpoint)")
+    arg_parser.add_argument("--restart", action="store_true", help="ignore any checkpoint and overwrite the output")
+    args = arg_parser.parse_args()
+
+    output_format = os.path.splitext(args.output)[1].lower().lstrip(".")
+    if output_format not in ("jsonl", "csv"):
+        arg_parser.error("--output must end in .jsonl or .csv")
+    job_profile = get_profile_index(args.profiles).get(args.level, args.role)
+    if job_profile is None:
+        arg_parser.error(f"No profile for level {args.level!r} and role {args.role!r} in {args.profiles}")
+
+    checkpoint = Checkpoint(args.checkpoint or args.output + ".checkpoint",
+                            {"level": args.level, "role": args.role, "format": output_format, "details": args.details})
+    try:
+        resuming = not args.restart and os.path.exists(args.output) and checkpoint.load()
+    except ValueError as e:
+        arg_parser.error(str(e))
+    if resuming:
+        _truncate_partial_line(args.output)
+        print(f"Resuming: {len(checkpoint.done)} files already done")
+
+    evaluator = BatchEvaluator(max_workers=args.workers, timeout=args.timeout)
+    skipped = 0
+
+    def pending_files():
+        nonlocal skipped
+        for path in args.inputs:
+            for name, read in iter_resume_files(path):
+                if name in checkpoint.done:
+                    skipped += 1
+                    continue
+                try:
+                    data = read()
+                except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+                    print(f"Could not read {name}:", e)
+                    continue
+                yield name, data
+
+    succeeded, failed, seconds = 0, 0, []
+    start = time.perf_counter()
+    last_progress = start
+    with open(args.output, "a" if resuming else "w", newline="" if output_format == "csv" else None) as f:
+        writer = JSONLWriter(f) if output_format == "jsonl" else CSVWriter(f, write_header=not resuming)
+        checkpoint.open(fresh=not resuming)
+        try:
+            # A couple of files queued per worker keeps every worker busy without reading the whole input up front
+            for _, result in evaluator.iter_evaluate(pending_files(), job_profile, max_pending=2 * evaluator.max_workers):
+                writer.write(result_row(result, args.details))
+                if not result.get("transient"):
+                    checkpoint.add(result["name"])
+                seconds.append(result.get("seconds", 0.0))
+                if "error" in result:
+                    failed += 1
+                    retry = " (will be retried on the next run)" if result.get("transient") else ""
+                    print(f"Failed: {result['name']}: {result['error']}{retry}")
+                else:
+                    succeeded += 1
+                now = time.perf_counter()
+                if now - last_progress >= 10:
+                    last_progress = now
+                    print(f"{succeeded + failed} files done ({(succeeded + failed) / (now - start):.2f} files/s)")
+        except KeyboardInterrupt:
+            print("\nInterrupted; run the same command again to resume.")
+        finally:
+            evaluator.shutdown()
+            checkpoint.close()
+    print_report(succeeded, failed, skipped, seconds, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
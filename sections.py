@@ -0,0 +1,133 @@
+import re
+from typing import NamedTuple
+
+# Canonical section names and the headings that introduce them
+SECTION_ALIASES = {
+    "professional_summary": ["professional summary", "summary", "objective", "career objective",
+                             "profile", "professional profile", "about me"],
+    "work_experience": ["work experience", "experience", "employment history", "professional experience",
+                        "work history", "employment"],
+    "education": ["education", "academic background", "academics"],
+    "skills": ["skills", "technical skills", "core competencies", "key skills"],
+    "projects": ["projects", "personal projects", "academic projects"],
+    "achievements": ["achievements", "awards", "honors & awards", "honors and awards"],
+    "certifications": ["certifications", "licenses & certifications", "licenses and certifications",
+                       "certificates"],
+}
+
+# The pseudo-section holding the contact details above the first heading
+HEADER = "header"
+
+
+class Section(NamedTuple):
+    """
+    One section of a resume as offsets into the original text.
+    The heading line is text[start:body_start]; the section's content is
+    text[body_start:end]. The header pseudo-section has no heading line.
+    """
+    name: str
+    heading: str
+    start: int
+    body_start: int
+    end: int
+
+    def body(self, text: str) -> str:
+        return text[self.body_start:self.end]
+
+    def lines(self, text: str) -> list:
+        """The section's non-blank lines, stripped."""
+        return [line.strip() for line in self.body(text).split("\n") if line.strip()]
+
+
+def _normalize_heading(heading: str) -> str:
+    return " ".join(heading.lower().split())
+
+
+def _trie_alternation(aliases) -> str:
+    """
+    A regex alternation of the aliases, factored into a trie by common prefix:
+    "skills|summary" becomes "s(?:kills|ummary)", so a line that can't start a
+    heading fails on its first character instead of trying every alias.
+    """
+    trie = {}
+    for alias in aliases:
+        node = trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        branches = [(r"[ \t]+" if char == " " else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # An alias can end here, or continue into a longer one
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class SectionSplitter:
+    """
+    Splits resume text into sections in one pass of a compiled pattern.
+
+    A heading is a line that consists of nothing but one of the aliases, give or
+    take case, extra spaces, a leading bullet or number ("1.", "■") and trailing
+    punctuation ("Skills:"). A line that merely mentions "skills" is content,
+    not a heading. The longest alias wins, so "Technical Skills" is one heading.
+
+    The pattern runs over a lowercased copy of the text and starts with a
+    literal newline, which lets the regex engine jump from line to line.
+    """
+
+    def __init__(self, aliases: dict = None):
+        aliases = SECTION_ALIASES if aliases is None else aliases
+        self.canonical = {_normalize_heading(alias): name for name, names in aliases.items() for alias in names}
+        pattern = (
+            r"\n[ \t]*(?:[^\w\s]+[ \t]*|\d{1,2}[.)][ \t]*)?"
+            rf"(?P<heading>{_trie_alternation(self.canonical)})"
+            r"[ \t]*[^\w\s]*[ \t]*$"
+        )
+        self.pattern = re.compile(pattern, re.MULTILINE)
+        # For the rare text whose lowercase form has a different length (so offsets wouldn't line up)
+        self.pattern_ignorecase = re.compile(pattern, re.MULTILINE | re.IGNORECASE)
+
+    def split(self, text: str) -> list:
+        """
+        The sections of text in order, starting with the header pseudo-section
+        (everything before the first heading). A section name can appear more
+        than once if the resume repeats a heading.
+        """
+        # The leading newline lets the first line match too; offsets below are shifted back by one
+        lowered = "\n" + text.lower()
+        if len(lowered) == len(text) + 1:
+            headings = list(self.pattern.finditer(lowered))
+        else:
+            headings = list(self.pattern_ignorecase.finditer("\n" + text))
+        first = headings[0].start() if headings else len(text)
+        sections = [Section(HEADER, "", 0, 0, first)]
+        for index, match in enumerate(headings):
+            start = match.start()
+            end = headings[index + 1].start() if index + 1 < len(headings) else len(text)
+            # The body starts on the line after the heading
+            body_start = min(match.end(), end)
+            heading = text[match.start("heading") - 1:match.end("heading") - 1]
+            sections.append(Section(self.canonical[_normalize_heading(heading)], heading, start, body_start, end))
+        return sections
+
+
+_default_splitter = None
+
+
+def split_sections(text: str) -> list:
+    """Splits text with the default aliases; see SectionSplitter.split."""
+    global _default_splitter
+    if _default_splitter is None:
+        _default_splitter = SectionSplitter()
+    return _default_splitter.split(text)
+
+
+def section_lines(text: str, sections, name: str) -> list:
+    """The stripped, non-blank lines of every section with this name, in order."""
+    return [line for section in sections if section.name == name for line in section.lines(text)]
@@ -0,0 +1,294 @@
+"""
+HTTP service that parses, scores and ranks resumes for other systems (e.g. an ATS).
+
+Every upload becomes a job on a bounded queue. The request returns at once with
+202 and the job's id; the caller polls GET /jobs/{id} for the result. A fixed
+number of dispatchers take jobs off the queue and run them on a warm pool of
+worker processes (see batch.BatchEvaluator). When the queue is full, submissions
+are turned away with 429 and a Retry-After estimate instead of piling up.
+
+Files are sent as multipart fields named "file" (repeat the field to rank
+several), or as the raw request body with ?name=resume.pdf.
+
+    POST /parse                              -> 202 {"job_id": ..., "status_url": ...}
+    POST /score?level=Intern&role=...        -> 202
+    POST /rank?level=Intern&role=...         -> 202 (at most MAX_RANK_FILES files, else 413)
+    GET  /jobs/{job_id}?wait=10              -> {"status": "queued" | "running" | "done" | "failed", "result": ...}
+    GET  /health                             -> queue depth and job counts
+
+wait (seconds, at most MAX_POLL_WAIT) holds the poll open until the job finishes.
+
+    python service.py --port 8080
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+import uuid
+from concurrent.futures.process import BrokenProcessPool
+
+from aiohttp import web
+
+from batch import CRASHED, DEFAULT_TIMEOUT, BatchEvaluator, evaluate_file, parse_file
+from records import Record
+from score_batch import result_row
+from utils import get_profile_index
+
+# Jobs waiting beyond this many are rejected with 429
+QUEUE_SIZE = int(os.environ.get("RESUME_PARSER_SERVICE_QUEUE_SIZE", "64"))
+SERVICE_WORKERS = int(os.environ.get("RESUME_PARSER_SERVICE_WORKERS", str(os.cpu_count() or 1)))
+# Finished jobs are forgotten this many seconds after they finish
+JOB_TTL = float(os.environ.get("RESUME_PARSER_SERVICE_JOB_TTL", "600"))
+MAX_REQUEST_BYTES = int(os.environ.get("RESUME_PARSER_SERVICE_MAX_REQUEST_BYTES", str(100 * 1024 * 1024)))
+# A /rank job takes one queue slot but scores its files side by side, so its size is capped
+MAX_RANK_FILES = int(os.environ.get("RESUME_PARSER_SERVICE_MAX_RANK_FILES", "20"))
+MAX_POLL_WAIT = 30
+
+
+def _json_default(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    return str(value)
+
+
+def json_response(data, status: int = 200, headers: dict = None) -> web.Response:
+    return web.json_response(data, status=status, headers=headers,
+                             dumps=lambda value: json.dumps(value, default=_json_default))
+
+
+class Job:
+    """One queued request and, once it has run, its result."""
+
+    def __init__(self, kind: str, run):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        # A coroutine function: run() -> (result, error)
+        self.run = run
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        data = {"job_id": self.id, "kind": self.kind, "status": self.status}
+        if self.started is not None:
+            data["queued_seconds"] = round(self.started - self.created, 4)
+        if self.finished is not None:
+            data["run_seconds"] = round(self.finished - self.started, 4)
+            data["result"] = self.result
+            if self.error is not None:
+                data["error"] = self.error
+        return data
+
+
+class ScoringService:
+    """
+    The job queue, its dispatchers and the worker pool behind the HTTP handlers.
+    Handlers are the handle_* methods; create_app() wires them to routes.
+    """
+
+    def __init__(self, workers: int = SERVICE_WORKERS, queue_size: int = QUEUE_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT, job_ttl: float = JOB_TTL, max_rank_files: int = MAX_RANK_FILES):
+        self.evaluator = BatchEvaluator(max_workers=workers, timeout=timeout)
+        self.queue_size = queue_size
+        self.max_rank_files = max_rank_files
+        self.job_ttl = job_ttl
+        self.jobs = {}
+        self.queue = None
+        self._tasks = []
+        # Moving average of how long a job runs, for Retry-After
+        self._average_run_seconds = 1.0
+
+    # --- LIFECYCLE ---
+
+    async def start(self, app=None):
+        self.queue = asyncio.Queue(self.queue_size)
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        await loop.run_in_executor(None, self.evaluator.warm_up)
+        print(f"{self.evaluator.max_workers} workers ready in {time.perf_counter() - started:.1f}s")
+        # One dispatcher per worker: a job starts as soon as a worker is free for it
+        self._tasks = [asyncio.create_task(self._dispatch()) for _ in range(self.evaluator.max_workers)]
+        self._tasks.append(asyncio.create_task(self._expire_jobs()))
+
+    async def stop(self, app=None):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.evaluator.shutdown()
+
+    # --- JOBS ---
+
+    def submit(self, kind: str, run) -> Job:
+        """Queues a job. Raises asyncio.QueueFull if QUEUE_SIZE jobs are already waiting."""
+        job = Job(kind, run)
+        self.queue.put_nowait(job)
+        self.jobs[job.id] = job
+        return job
+
+    async def run_in_pool(self, func, *args):
+        return await asyncio.wrap_future(self.evaluator.submit(func, *args))
+
+    async def _dispatch(self):
+        while True:
+            job = await self.queue.get()
+            job.status = "running"
+            job.started = time.time()
+            try:
+                job.result, job.error = await job.run()
+            except BrokenProcessPool:
+                job.error = CRASHED
+            except Exception as e:
+                job.error = str(e)
+            job.finished = time.time()
+            # Drop the closure, and with it the uploaded files, rather than keep them until the job expires
+            job.run = None
+            job.status = "failed" if job.error is not None else "done"
+            job.done.set()
+            self._average_run_seconds = 0.9 * self._average_run_seconds + 0.1 * (job.finished - job.started)
+            self.queue.task_done()
+
+    async def _expire_jobs(self):
+        while True:
+            await asyncio.sleep(min(self.job_ttl, 60))
+            cutoff = time.time() - self.job_ttl
+            for job_id in [job.id for job in self.jobs.values() if job.finished is not None and job.finished < cutoff]:
+                del self.jobs[job_id]
+
+    def retry_after(self) -> int:
+        """Seconds until the queue has likely drained enough to take another job."""
+        return max(1, math.ceil(self.queue.qsize() * self._average_run_seconds / self.evaluator.max_workers))
+
+    # --- HANDLERS ---
+
+    async def handle_parse(self, request: web.Request) -> web.Response:
+        files = await read_uploads(request)
+        if len(files) != 1:
+            return json_response({"error": "Send exactly one file"}, status=400)
+        name, data = files[0]
+
+        async def run():
+            result = await self.run_in_pool(parse_file, name, data, self.evaluator.timeout)
+            return result, result.get("error")
+        return self._accept(request, "parse", run)
+
+    async def handle_score(self, request: web.Request) -> web.Response:
+        job_profile = self._job_profile(request)
+        if job_profile is None:
+            return json_response({"error": "Unknown or missing level/role"}, status=400)
+        files = await read_uploads(request)
+        if len(files) != 1:
+            return json_response({"error": "Send exactly one file"}, status=400)
+        name, data = files[0]
+
+        async def run():
+            result = await self.run_in_pool(evaluate_file, name, data, job_profile, self.evaluator.timeout)
+            return result, result.get("error")
+        return self._accept(request, "score", run)
+
+    async def handle_rank(self, request: web.Request) -> web.Response:
+        job_profile = self._job_profile(request)
+        if job_profile is None:
+            return json_response({"error": "Unknown or missing level/role"}, status=400)
+        files = await read_uploads(request)
+        if not files:
+            return json_response({"error": "Send at least one file"}, status=400)
+        if len(files) > self.max_rank_files:
+            return json_response({"error": f"Send at most {self.max_rank_files} files to rank at once"}, status=413)
+
+        async def run():
+            # One queue slot, but the files are scored side by side across the pool
+            results = await asyncio.gather(*(
+                self.run_in_pool(evaluate_file, name, data, job_profile, self.evaluator.timeout)
+                for name, data in files
+            ))
+            rows = [result_row(result) for result in results]
+            return sorted(rows, key=lambda row: row.get("score", -1), reverse=True), None
+        return self._accept(request, "rank", run)
+
+    async def handle_job(self, request: web.Request) -> web.Response:
+        job = self.jobs.get(request.match_info["job_id"])
+        if job is None:
+            return json_response({"error": "No such job (finished jobs expire after a while)"}, status=404)
+        try:
+            wait = min(float(request.query.get("wait", 0)), MAX_POLL_WAIT)
+        except ValueError:
+            return json_response({"error": "wait must be a number of seconds"}, status=400)
+        if wait > 0 and not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+        return json_response(job.to_dict())
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        statuses = {}
+        for job in self.jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return json_response({
+            "workers": self.evaluator.max_workers,
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue_size,
+            "jobs": statuses,
+        })
+
+    def _accept(self, request: web.Request, kind: str, run) -> web.Response:
+        try:
+            job = self.submit(kind, run)
+        except asyncio.QueueFull:
+            return json_response({"error": "Too many jobs queued; retry later"}, status=429,
+                                 headers={"Retry-After": str(self.retry_after())})
+        status_url = str(request.app.router["job"].url_for(job_id=job.id))
+        return json_response({"job_id": job.id, "status_url": status_url}, status=202,
+                             headers={"Location": status_url})
+
+    def _job_profile(self, request: web.Request):
+        return get_profile_index().get(request.query.get("level"), request.query.get("role"))
+
+
+async def read_uploads(request: web.Request) -> list:
+    """The uploaded files as (name, bytes): multipart fields named "file", or the raw body named by ?name=."""
+    if request.content_type.startswith("multipart/"):
+        files = []
+        reader = await request.multipart()
+        async for part in reader:
+            if part.name == "file":
+                files.append((part.filename or "resume", bytes(await part.read())))
+        return files
+    body = await request.read()
+    return [(request.query.get("name", "resume"), body)] if body else []
+
+
+def create_app(service: ScoringService = None) -> web.Application:
+    service = service or ScoringService()
+    app = web.Application(client_max_size=MAX_REQUEST_BYTES)
+    app.router.add_post("/parse", service.handle_parse)
+    app.router.add_post("/score", service.handle_score)
+    app.router.add_post("/rank", service.handle_rank)
+    app.router.add_get("/jobs/{job_id}", service.handle_job, name="job")
+    app.router.add_get("/health", service.handle_health)
+    app.on_startup.append(service.start)
+    app.on_cleanup.append(service.stop)
+    return app
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--host", default="0.0.0.0")
+    arg_parser.add_argument("--port", type=int, default=8080)
+    arg_parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="worker processes")
+    arg_parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="jobs that can wait before 429s")
+    arg_parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="per-file time limit in seconds")
+    args = arg_parser.parse_args()
+
+    service = ScoringService(workers=args.workers, queue_size=args.queue_size, timeout=args.timeout)
+    web.run_app(create_app(service), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+def _is_word_char(char: str) -> bool:
+    """Mirrors the regex \\w class: alphanumerics and the underscore."""
+    return char.isalnum() or char == "_"
+
+
+def _fold_case(text: str) -> str:
+    """Lowercases text while keeping every character at its original offset."""
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # A few characters (e.g. 'İ') expand when lowercased; keep those as-is so offsets line up.
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class SkillMatcher:
+    """
+    Finds every known skill in a single pass over the text.
+
+    The skills are compiled once into a character trie. Matching walks the trie
+    only from positions where a regex word boundary (\\b) holds, and accepts a
+    match only if a word boundary also holds at its end. This gives the same
+    whole-word, case-insensitive results as running
+    re.search(r"\\b" + re.escape(skill) + r"\\b", text, re.IGNORECASE) per skill.
+
+    With whole_words=False the boundary checks are skipped and any occurrence
+    counts, like `skill.lower() in text.lower()`.
+    """
+
+    _TERMINAL = "\0skills"
+
+    def __init__(self, skills, whole_words: bool = True):
+        self.skills = list(skills)
+        self.whole_words = whole_words
+        self._trie = {}
+        for skill in self.skills:
+            if not skill:
+                continue
+            node = self._trie
+            for char in _fold_case(skill):
+                node = node.setdefault(char, {})
+            found = node.setdefault(self._TERMINAL, [])
+            if skill not in found:
+                found.append(skill)
+
+    def _is_boundary(self, text: str, pos: int) -> bool:
+        before = pos > 0 and _is_word_char(text[pos - 1])
+        after = pos < len(text) and _is_word_char(text[pos])
+        return before != after
+
+    def find_matches(self, text: str) -> list:
+        """
+        Returns every (start, end, skill) occurrence in the text, ordered by offset.
+        Overlapping matches (e.g. "React" inside "React Native") are all reported.
+        """
+        matches = []
+        if not text:
+            return matches
+        folded = _fold_case(text)
+        length = len(folded)
+        for start in range(length):
+            if self.whole_words and not self._is_boundary(text, start):
+                continue
+            node = self._trie
+            pos = start
+            while pos < length:
+                node = node.get(folded[pos])
+                if node is None:
+                    break
+                pos += 1
+                found = node.get(self._TERMINAL)
+                if found and (not self.whole_words or self._is_boundary(text, pos)):
+                    for skill in found:
+                        matches.append((start, pos, skill))
+        return matches
+
+    def extract(self, text: str) -> list:
+        """Returns the sorted, de-duplicated list of skills present in the text."""
+        return sorted({skill for _, _, skill in self.find_matches(text)})
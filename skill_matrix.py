@@ -0,0 +1,168 @@
+import numpy as np
+
+from document import as_document
+from skill_matcher import SkillMatcher
+from utils import compile_profile
+
+# Caps applied by score_skill_alignment to each component
+REQUIRED_CAP = 15
+PREFERRED_CAP = 5
+KEYWORD_CAP = 10
+
+
+def flatten_profiles(job_profiles: dict) -> list:
+    """Turns {level: {role: profile}} into a list of ((level, role), profile) pairs."""
+    return [((level, role), profile) for level, roles in job_profiles.items() for role, profile in roles.items()]
+
+
+def build_vocabulary(profiles, known_skills=()) -> list:
+    """Every lowercase term used by the profiles, plus the known skills, in a stable order."""
+    vocabulary = set(skill.lower() for skill in known_skills)
+    for profile in profiles:
+        profile = compile_profile(profile)
+        vocabulary.update(profile.required_skills + profile.preferred_skills + profile.keywords)
+    return sorted(vocabulary)
+
+
+class ProfileMatrix:
+    """
+    The skill-alignment weights of M profiles over a shared vocabulary of V terms.
+
+    required, preferred and keywords are M x V 0/1 matrices marking which terms each
+    profile lists in required_skills, preferred_skills and keywords + job_specific_keywords.
+    """
+
+    def __init__(self, profiles, vocabulary):
+        self.vocabulary = list(vocabulary)
+        index = {term: i for i, term in enumerate(self.vocabulary)}
+        shape = (len(profiles), len(self.vocabulary))
+        self.required = np.zeros(shape, dtype=np.int32)
+        self.preferred = np.zeros(shape, dtype=np.int32)
+        self.keywords = np.zeros(shape, dtype=np.int32)
+        for row, profile in enumerate(profiles):
+            profile = compile_profile(profile)
+            self.required[row, [index[term] for term in profile.required_skills]] = 1
+            self.preferred[row, [index[term] for term in profile.preferred_skills]] = 1
+            self.keywords[row, [index[term] for term in profile.keywords]] = 1
+
+
+class ResumeMatrix:
+    """
+    N resumes encoded once as presence vectors over the vocabulary.
+
+    For each term we record whether it occurs in the experience/project text
+    (content), the skills section (skills), content + skills together (combined)
+    and the whole resume (full) -- the four texts score_skill_alignment checks.
+    Occurrences are substring matches, as in score_skill_alignment, found for
+    the whole vocabulary in one SkillMatcher pass over each text.
+    """
+
+    def __init__(self, resumes, vocabulary):
+        self.vocabulary = list(vocabulary)
+        index = {term: i for i, term in enumerate(self.vocabulary)}
+        matcher = SkillMatcher(self.vocabulary, whole_words=False)
+        shape = (len(resumes), len(self.vocabulary))
+        self.content = np.zeros(shape, dtype=bool)
+        self.skills = np.zeros(shape, dtype=bool)
+        self.combined = np.zeros(shape, dtype=bool)
+        self.full = np.zeros(shape, dtype=bool)
+        for row, resume_data in enumerate(resumes):
+            document = as_document(resume_data)
+            exp_text = document.section_text("work_experience", "experience", sep=" ", lower=True)
+            project_text = document.section_text("projects", sep=" ", lower=True)
+            content_text = exp_text + " " + project_text
+            skill_text = document.section_text("skills", sep=" ", lower=True)
+            # One pass over content + skills: a match's offsets tell which of the two it lies in
+            for start, end, term in matcher.find_matches(content_text + " " + skill_text):
+                col = index[term]
+                self.combined[row, col] = True
+                if end <= len(content_text):
+                    self.content[row, col] = True
+                elif start > len(content_text):
+                    self.skills[row, col] = True
+            for _, _, term in matcher.find_matches(document.lower_text):
+                self.full[row, index[term]] = True
+
+    def packed(self) -> dict:
+        """Bit-packed copies of the presence matrices, for caching or sending between processes."""
+        return {name: np.packbits(getattr(self, name), axis=1)
+                for name in ("content", "skills", "combined", "full")}
+
+
+def skill_alignment_matrix(resume_matrix: ResumeMatrix, profile_matrix: ProfileMatrix) -> dict:
+    """
+    Skill-alignment scores for every (resume, profile) pair as N x M arrays.
+
+    Reproduces score_skill_alignment exactly, including its de-duplication: a term
+    that scores as a required skill is not counted again as a preferred skill or
+    keyword, and one that scores as a preferred skill is not counted as a keyword.
+    """
+    content = resume_matrix.content.astype(np.int32)
+    skills = resume_matrix.skills.astype(np.int32)
+    combined = resume_matrix.combined.astype(np.int32)
+    full = resume_matrix.full.astype(np.int32)
+    in_content_or_skills = content | skills
+    required, preferred, keywords = profile_matrix.required, profile_matrix.preferred, profile_matrix.keywords
+
+    # Required: 2 points if used in experience/projects, else 1 if listed under skills
+    required_points = 2 * (content @ required.T) + (skills * (1 - content)) @ required.T
+
+    # Preferred: found anywhere in content + skills, unless already counted as required
+    preferred_points = combined @ preferred.T - (combined * in_content_or_skills) @ (preferred * required).T
+
+    # Keywords: found anywhere in the resume, unless already counted as required or preferred
+    keyword_points = (
+        full @ keywords.T
+        - (full * in_content_or_skills) @ (keywords * required).T
+        - (full * combined) @ (keywords * preferred).T
+        + (full * combined * in_content_or_skills) @ (keywords * preferred * required).T
+    )
+
+    required_score = np.minimum(required_points, REQUIRED_CAP)
+    preferred_score = np.minimum(preferred_points, PREFERRED_CAP)
+    keyword_score = np.minimum(keyword_points, KEYWORD_CAP)
+    return {
+        "total": required_score + preferred_score + keyword_score,
+        "required": required_score,
+        "preferred": preferred_score,
+        "keywords": keyword_score
+    }
+
+
+def skill_alignment_results(resume_matrix: ResumeMatrix, profile_matrix: ProfileMatrix, column: int = 0) -> list:
+    """
+    The (score, breakdown) that score_skill_alignment returns for each resume
+    against the profile in the given column of profile_matrix.
+    """
+    vocabulary = np.array(resume_matrix.vocabulary, dtype=object)
+    required = profile_matrix.required[column].astype(bool)
+    preferred = profile_matrix.preferred[column].astype(bool)
+    keywords = profile_matrix.keywords[column].astype(bool)
+    scores = skill_alignment_matrix(resume_matrix, profile_matrix)["total"][:, column]
+    results = []
+    for row, score in enumerate(scores):
+        # The terms each category counted, after the same de-duplication as skill_alignment_matrix
+        required_hit = required & (resume_matrix.content[row] | resume_matrix.skills[row])
+        preferred_hit = preferred & resume_matrix.combined[row] & ~required_hit
+        keyword_hit = keywords & resume_matrix.full[row] & ~required_hit & ~preferred_hit
+        results.append((int(score), {
+            "skill_usage": list(vocabulary[required_hit]),
+            "preferred_skills": list(vocabulary[preferred_hit]),
+            "keywords": list(vocabulary[keyword_hit]),
+        }))
+    return results
+
+
+def rank_matrix(resumes, job_profiles: dict, known_skills=None) -> tuple:
+    """
+    Skill-alignment scores of N resumes against every profile in job_profiles.
+    The vocabulary also covers known_skills (by default every skill in skills.json).
+    Returns (profile keys, N x M total scores).
+    """
+    if known_skills is None:
+        from parser import all_known_skills as known_skills
+    keyed_profiles = flatten_profiles(job_profiles)
+    profiles = [profile for _, profile in keyed_profiles]
+    vocabulary = build_vocabulary(profiles, known_skills)
+    scores = skill_alignment_matrix(ResumeMatrix(resumes, vocabulary), ProfileMatrix(profiles, vocabulary))
+    return [key for key, _ in keyed_profiles], scores["total"]
@@ -0,0 +1,51 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        text = form.get("text", [""])[0]
+        self.server.requests += 1
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if self.server.fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+        # One "issue" per occurrence of each marker word, so tests can predict the count
+        matches = [{"message": "Possible spelling mistake", "offset": i}
+                   for marker in self.server.markers for i in range(text.count(marker))]
+        body = json.dumps({"matches": matches}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def languagetool_stub():
+    """
+    A minimal LanguageTool-compatible server on a free local port. It reports one
+    issue per occurrence of each marker word; set .fail to answer with 500s and
+    .delay to answer slowly. Yields (server, url); .requests counts the calls.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.markers = ("teh", "recieve")
+    server.delay = 0.0
+    server.fail = False
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/v2/check"
+    server.shutdown()
+    server.server_close()
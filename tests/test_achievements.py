@@ -0,0 +1,93 @@
+import re
+
+import pytest
+
+from achievements import POINTS_BY_FLAGS, AchievementClassifier, score_lines
+from new_scoring import achievement_verbs, action_verbs, metric_pattern_names, metric_patterns, recognitions
+
+LINES = [
+    "Increased revenue by 25% in two quarters", "Cut costs by 30%.", "cut", "Cutting-edge research",
+    "Led 5+ engineers", "led the team", "Ledger reconciliation", "Managed a $2 million budget",
+    "managed $1,200k in spend", "Built 100x faster CI with C++", "Rewrote the C++ core; surpassed target",
+    "Node.js services serving 10k users", "Node.js, Express.js", ".NET migration ahead of schedule",
+    "Migrated to .NET 6, delivered under budget", "Awarded best paper; won 3 deals", "Top performer 2021",
+    "Employee of the month", "Ranked #1 of 40 employees", "Recognized for mentoring 12 team members",
+    "Automated 8 campaigns, boosted leads by 40%", "Streamlined onboarding", "Re-architected the API",
+    "OPTIMIZED QUERIES", "Mentored", "", "   ", "—", "Python, SQL, Excel", "B.Tech Computer Science, 2019",
+]
+
+
+class SuffixLemmatizer:
+    """Stands in for WordNetLemmatizer when its data isn't installed: nouns lose an "s", verbs an "ed"."""
+
+    def lemmatize(self, word, pos="n"):
+        if pos == "v":
+            return word[:-2] if word.endswith("ed") and len(word) > 4 else word
+        return word[:-1] if word.endswith("s") and not word.endswith("ss") else word
+
+
+@pytest.fixture
+def lemmatizer():
+    nltk = pytest.importorskip("nltk")
+    try:
+        nltk.data.find("corpora/wordnet")
+    except LookupError:
+        return SuffixLemmatizer()
+    return nltk.stem.WordNetLemmatizer()
+
+
+def baseline_points(line: str, lemmatizer) -> int:
+    """The original if/elif ladder in score_quantifiable_achievements for one line."""
+    from nltk.tokenize import TreebankWordTokenizer
+
+    lemmatized_action_verbs = {lemmatizer.lemmatize(v, pos='v') for v in action_verbs}
+    lemmatized_achievement_verbs = {lemmatizer.lemmatize(v, pos='v') for v in achievement_verbs}
+    lemmatized_recognitions = {lemmatizer.lemmatize(v, pos='v') for v in recognitions}
+    clean_line = re.sub(r'[^\w\s]', '', line).lower()
+    # word_tokenize without its sentence splitter, which needs the punkt data; no punctuation is left to split on
+    words_in_line = {lemmatizer.lemmatize(word) for word in TreebankWordTokenizer().tokenize(clean_line)}
+    metric_found = any(re.search(pattern, line) for pattern in metric_patterns)
+    action = not words_in_line.isdisjoint(lemmatized_action_verbs)
+    achievement = not words_in_line.isdisjoint(lemmatized_achievement_verbs)
+    recognition = not words_in_line.isdisjoint(lemmatized_recognitions)
+    if action and achievement and metric_found and recognition:
+        return 20
+    if action and achievement and metric_found:
+        return 18
+    if action and achievement:
+        return 15
+    if achievement and metric_found:
+        return 12
+    if action and metric_found:
+        return 10
+    if action:
+        return 5
+    if achievement:
+        return 7
+    if metric_found:
+        return 3
+    return 0
+
+
+def make_classifier(lemmatizer) -> AchievementClassifier:
+    return AchievementClassifier(
+        lemmatizer,
+        {lemmatizer.lemmatize(v, pos='v') for v in action_verbs},
+        {lemmatizer.lemmatize(v, pos='v') for v in achievement_verbs},
+        {lemmatizer.lemmatize(v, pos='v') for v in recognitions},
+        dict(zip(metric_pattern_names, metric_patterns))
+    )
+
+
+@pytest.mark.parametrize("line", LINES)
+def test_line_points_match_the_baseline(line, lemmatizer):
+    assert POINTS_BY_FLAGS[make_classifier(lemmatizer).line_flags(line)] == baseline_points(line, lemmatizer)
+
+
+def test_batch_scores_match_the_baseline(lemmatizer):
+    classifier = make_classifier(lemmatizer)
+    resumes = [LINES[:10], LINES[10:], LINES, []]
+    for lines, flags in zip(resumes, classifier.classify_batch(resumes)):
+        expected_lines = [line for line in lines if baseline_points(line, lemmatizer)]
+        expected_score = sum(baseline_points(line, lemmatizer) for line in lines)
+        assert score_lines(lines, flags) == (expected_score, expected_lines)
@@ -0,0 +1,47 @@
+import os
+
+from batch import BatchEvaluator
+from cache import ContentCache
+
+
+def test_warm_up_reaches_every_worker(monkeypatch):
+    monkeypatch.setenv("RESUME_PARSER_ALLOW_DOWNLOADS", "0")
+    evaluator = BatchEvaluator(max_workers=3)
+    try:
+        assert len(evaluator.warm_up()) == 3
+    finally:
+        evaluator.shutdown()
+
+
+class WorkerKiller:
+    """Unpickling this in a worker kills that worker, like an OOM kill would."""
+
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+def test_a_crash_only_fails_the_file_that_caused_it(monkeypatch, tmp_path):
+    monkeypatch.setenv("RESUME_PARSER_ALLOW_DOWNLOADS", "0")
+    monkeypatch.setenv("RESUME_PARSER_CACHE_DIR", str(tmp_path))
+    files = [("a.pdf", b"not a pdf"), ("killer.pdf", WorkerKiller()), ("b.pdf", b"not a pdf"), ("c.pdf", b"not a pdf")]
+    evaluator = BatchEvaluator(max_workers=2, timeout=30)
+    try:
+        results = evaluator.parse(files)
+    finally:
+        evaluator.shutdown()
+    assert [result["name"] for result in results] == [name for name, _ in files]
+    errors = [result.get("error") for result in results]
+    assert errors[1] == "Worker process crashed" and results[1]["transient"]
+    assert all(error != "Worker process crashed" for error in errors[:1] + errors[2:])
+
+
+def test_worker_cache_counts_reach_the_database(monkeypatch, tmp_path):
+    monkeypatch.setenv("RESUME_PARSER_CACHE_DIR", str(tmp_path))
+    evaluator = BatchEvaluator(max_workers=1, timeout=30)
+    try:
+        evaluator.parse([("a.pdf", b"not a pdf"), ("b.pdf", b"not a pdf")])
+    finally:
+        evaluator.shutdown()
+    # The worker is still alive (or killed without running atexit), yet its lookups are counted
+    stats = ContentCache("parsed_resumes", directory=str(tmp_path)).stats()
+    assert stats["misses"] == 2
@@ -0,0 +1,41 @@
+import sqlite3
+
+from cache import ContentCache
+
+
+def entry_bytes(cache: ContentCache) -> tuple:
+    """(tracked total, actual sum of entry sizes) straight from the database."""
+    db = sqlite3.connect(cache._db_path)
+    tracked = db.execute("SELECT count FROM counters WHERE name = 'total_bytes'").fetchone()[0]
+    actual = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    db.close()
+    return tracked, actual
+
+
+def test_lookups_do_not_write_until_flushed(tmp_path):
+    cache = ContentCache("test", directory=str(tmp_path))
+    cache.put("a", {"value": 1})
+    commits = cache._db.total_changes
+    for _ in range(100):
+        assert cache.get("a") == {"value": 1}
+        assert cache.get("missing") is None
+    assert cache._db.total_changes == commits
+
+    other = ContentCache("test", directory=str(tmp_path))
+    assert other.stats()["memory_hits"] == 0
+    cache.flush()
+    stats = other.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (100, 100)
+
+
+def test_total_size_is_tracked_through_replace_and_eviction(tmp_path):
+    cache = ContentCache("test", directory=str(tmp_path), max_bytes=100)
+    cache.put("a", b"x" * 40)
+    cache.put("a", b"x" * 30)
+    assert entry_bytes(cache) == (30, 30)
+    cache.put("b", b"x" * 40)
+    cache.put("c", b"x" * 40)
+    tracked, actual = entry_bytes(cache)
+    assert tracked == actual <= 100
+    cache.clear()
+    assert entry_bytes(cache) == (0, 0)
@@ -0,0 +1,15 @@
+from dates import find_date_ranges, parse_month_year
+from parser import extract_structured_experience
+
+
+def test_out_of_range_year_is_not_a_date():
+    assert parse_month_year("May 0000") is None
+    assert parse_month_year("May 2020").year == 2020
+
+
+def test_ranges_with_an_invalid_year_are_skipped():
+    text = "Engineer\nMay 0000 - Present\nAnalyst\nJan 2019 - Mar 2020"
+    ranges = find_date_ranges(text)
+    assert [(r.start_text, r.end_text) for r in ranges] == [("Jan 2019", "Mar 2020")]
+    jobs = extract_structured_experience(text)
+    assert jobs[-1]["start_date"] == "Jan 2019"
@@ -0,0 +1,101 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+import extractors
+
+DOCUMENT_XML = ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+                '<w:p><w:r><w:t>Python</w:t><w:tab/><w:t>C++</w:t></w:r></w:p></w:body></w:document>')
+
+
+def make_pdf(text: str) -> bytes:
+    pymupdf = pytest.importorskip("pymupdf")
+    doc = pymupdf.open()
+    doc.new_page().insert_text((50, 72), text)
+    return doc.tobytes()
+
+
+@pytest.mark.parametrize("engine_name", ["pymupdf", "pdfplumber"])
+def test_engines_read_a_memoryview(engine_name):
+    pytest.importorskip(engine_name)
+    data = make_pdf("Senior Software Engineer")
+    engine = extractors.get_pdf_engine(engine_name)
+    assert engine.page_count(memoryview(bytearray(data))) == 1
+    assert engine.page_range_text(memoryview(data), 0, 1) == ["Senior Software Engineer"]
+    assert extractors.detect_format(memoryview(data)) == "pdf"
+
+
+def make_docx() -> bytes:
+    docx = pytest.importorskip("docx")
+    from docx.enum.text import WD_BREAK
+    from docx.shared import Inches
+
+    document = docx.Document()
+    document.add_paragraph("Jane Doe")
+    contact = document.add_paragraph("Email:\tjane@example.com")
+    contact.paragraph_format.tab_stops.add_tab_stop(Inches(2))
+    contact.paragraph_format.tab_stops.add_tab_stop(Inches(4))
+    document.add_paragraph("SKILLS")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Python\tC++"
+    table.cell(0, 1).text = "Node.js"
+    table.cell(1, 0).paragraphs[0].paragraph_format.tab_stops.add_tab_stop(Inches(1))
+    table.cell(1, 0).add_paragraph("Second line\tin a cell")
+    table.cell(1, 1).text = ".NET"
+    experience = document.add_paragraph("Data Analyst")
+    experience.add_run().add_break()
+    experience.add_run("Acme Corp\t2020 - 2022")
+    experience.add_run().add_break(WD_BREAK.PAGE)
+    document.add_paragraph("EDUCATION")
+    stream = io.BytesIO()
+    document.save(stream)
+    return stream.getvalue()
+
+
+def test_docx_paragraphs_match_python_docx():
+    import docx
+    from docx.table import Table
+
+    data = make_docx()
+    expected = []
+    for block in docx.Document(io.BytesIO(data)).iter_inner_content():
+        if isinstance(block, Table):
+            expected.extend(p.text for row in block.rows for cell in row.cells for p in cell.paragraphs)
+        else:
+            expected.append(block.text)
+    with zipfile.ZipFile(io.BytesIO(data)) as archive, archive.open("word/document.xml") as stream:
+        assert list(extractors.iter_docx_paragraphs(stream)) == expected
+    assert "Email:\tjane@example.com" in expected
+
+
+def test_reading_an_upload_buffer_does_not_copy_it():
+    import tracemalloc
+
+    # A large DOCX: the probe and the text extraction only read the parts they need
+    archive_bytes = io.BytesIO()
+    with zipfile.ZipFile(archive_bytes, "w") as archive:
+        archive.writestr("word/document.xml", DOCUMENT_XML)
+        archive.writestr("word/media/padding.bin", os.urandom(8 * 1024 * 1024))
+    upload = io.BytesIO(archive_bytes.getvalue())
+    data = extractors.read_source(upload)
+
+    tracemalloc.start()
+    try:
+        assert extractors.detect_format(data) == "docx"
+        assert extractors.extract_docx_text(data) == "Python\tC++\n"
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 1024 * 1024
+
+
+def test_buffer_stream_reads_like_bytesio():
+    data = bytearray(range(256)) * 4
+    stream, expected = extractors.BufferStream(memoryview(data)[10:]), io.BytesIO(bytes(data[10:]))
+    for offset, whence, size in [(0, io.SEEK_SET, 5), (3, io.SEEK_CUR, 100), (-20, io.SEEK_END, 50), (0, io.SEEK_SET, -1)]:
+        assert stream.seek(offset, whence) == expected.seek(offset, whence)
+        assert stream.read(size) == expected.read(size)
+        assert stream.tell() == expected.tell()
+    assert stream.read(10) == b""
@@ -0,0 +1,93 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("requests")
+
+import cache
+import grammar
+from grammar import CircuitBreaker, CircuitOpenError, HTTPLanguageToolBackend
+
+
+def test_circuit_opens_after_repeated_failures_and_closes_after_a_good_trial(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(grammar.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] += 31
+    breaker.before_call()  # the half-open trial call
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # everyone else still fails fast during the trial
+    breaker.record_success()
+    breaker.before_call()
+
+
+def test_http_backend_counts_issues(languagetool_stub):
+    server, url = languagetool_stub
+    backend = HTTPLanguageToolBackend(url=url)
+    assert backend.check("I recieve teh mail and teh post") == 3
+    assert backend.check("All good here") == 0
+
+
+def test_failing_backend_falls_back_and_stops_being_called(languagetool_stub):
+    server, url = languagetool_stub
+    server.fail = True
+    backend = HTTPLanguageToolBackend(url=url, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    assert [backend.check("teh text") for _ in range(5)] == [None] * 5
+    assert server.requests == 2
+
+
+def test_slow_backend_times_out(languagetool_stub):
+    server, url = languagetool_stub
+    server.delay = 1.0
+    assert HTTPLanguageToolBackend(url=url, timeout=0.2).check("teh text") is None
+
+
+def test_failed_checks_are_not_cached(languagetool_stub, tmp_path, monkeypatch):
+    server, url = languagetool_stub
+    monkeypatch.setitem(cache._caches, "grammar", cache.ContentCache("grammar", directory=str(tmp_path)))
+    monkeypatch.setattr(grammar, "_backend", HTTPLanguageToolBackend(url=url))
+    server.fail = True
+    assert grammar.cached_check("teh  text\n") is None
+    server.fail = False
+    assert grammar.cached_check("teh text") == 1
+    assert grammar.cached_check(" teh text ") == 1
+    assert server.requests == 2
+
+
+def test_checks_beyond_max_concurrency_wait_their_turn():
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    class SlowBackend(grammar.GrammarBackend):
+        def _count(self, text, language):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return 0
+
+    backend = SlowBackend(max_concurrency=3)
+    with ThreadPoolExecutor(max_workers=12) as executor:
+        assert list(executor.map(backend.check, ["text"] * 24)) == [0] * 24
+    assert peak[0] == 3
+
+
+def test_text_is_only_sent_to_a_configured_server(monkeypatch):
+    monkeypatch.setattr(grammar, "GRAMMAR_BACKEND", "http")
+    monkeypatch.setattr(grammar, "LANGUAGETOOL_URL", None)
+    monkeypatch.setattr(grammar, "_backend", None)
+    assert isinstance(grammar.get_grammar_backend(), grammar.NullBackend)
+
+    monkeypatch.setattr(grammar, "LANGUAGETOOL_URL", "http://localhost:8081/v2/check")
+    monkeypatch.setattr(grammar, "_backend", None)
+    assert grammar.get_grammar_backend().url == "http://localhost:8081/v2/check"
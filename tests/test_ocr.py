@@ -0,0 +1,30 @@
+import pytest
+
+pytesseract = pytest.importorskip("pytesseract")
+
+import cache
+import ocr
+
+
+def test_cached_pages_are_not_rendered_again(tmp_path, monkeypatch):
+    monkeypatch.setitem(cache._caches, "ocr_pages", cache.ContentCache("ocr_pages", directory=str(tmp_path)))
+    monkeypatch.setattr(pytesseract, "get_tesseract_version", lambda: "5.0")
+    rendered = []
+
+    def render_pages(source, indexes, dpi=ocr.OCR_DPI):
+        rendered.append(list(indexes))
+        return {index: f"page {index}".encode() for index in indexes}
+
+    monkeypatch.setattr(ocr, "render_pages", render_pages)
+    monkeypatch.setattr(ocr, "_ocr_in_pool", lambda images, language, timeout, workers: {
+        index: png.decode().upper() for index, png in images.items()
+    })
+
+    pdf = b"%PDF-1.4 a scanned resume"
+    assert ocr.ocr_pages(pdf, [0, 2], workers=1) == {0: "PAGE 0", 2: "PAGE 2"}
+    assert ocr.ocr_pages(memoryview(pdf), [0, 1, 2], workers=1) == {0: "PAGE 0", 1: "PAGE 1", 2: "PAGE 2"}
+    assert ocr.ocr_pages(pdf, [0, 1, 2], workers=1) == {0: "PAGE 0", 1: "PAGE 1", 2: "PAGE 2"}
+    # Only pages without a cached text were rendered; a different file misses
+    assert rendered == [[0, 2], [1]]
+    ocr.ocr_pages(b"%PDF-1.4 another resume", [0], workers=1)
+    assert rendered[-1] == [0]
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+
+import resources
+from parser import extract_name, extract_names, parse_resumes
+
+
+class FakeNLP:
+    """Tags the given names as PERSON entities (and "Acme Corp" as an ORG) wherever they appear."""
+
+    def __init__(self, people):
+        self.people = people
+        self.pipe_calls = []
+
+    def __call__(self, text):
+        entities = [SimpleNamespace(text="Acme Corp", label_="ORG")] if "Acme Corp" in text else []
+        entities += [SimpleNamespace(text=f" {name} ", label_="PERSON") for name in self.people if name in text]
+        return SimpleNamespace(ents=entities)
+
+    def pipe(self, texts, batch_size=None, n_process=None):
+        texts = list(texts)
+        self.pipe_calls.append((len(texts), batch_size, n_process))
+        return (self(text) for text in texts)
+
+
+@pytest.fixture
+def nlp(monkeypatch):
+    nlp = FakeNLP(["Jane Doe", "Ravi Kumar"])
+    monkeypatch.setitem(resources._resources, "spacy", nlp)
+    return nlp
+
+
+# The regex fallback would take the first two capitalized words of each header instead
+HEADERS = ["Curriculum Vitae\nJane Doe\njane@example.com", "Acme Corp Engineer\nRavi Kumar", "Contact Me\nno name here"]
+
+
+def test_extract_names_returns_the_person_entity(nlp):
+    names = extract_names(HEADERS, batch_size=2, n_process=1)
+    assert names == ["Jane Doe", "Ravi Kumar", "Contact Me"]
+    assert nlp.pipe_calls == [(3, 2, 1)]
+    assert [extract_name(header) for header in HEADERS] == names
+
+
+def test_parse_resumes_names_every_resume_in_one_pipe_call(nlp):
+    texts = [header + "\nSKILLS\nPython, SQL" for header in HEADERS]
+    assert [parsed.name for parsed in parse_resumes(texts)] == ["Jane Doe", "Ravi Kumar", "Contact Me"]
+    assert len(nlp.pipe_calls) == 1
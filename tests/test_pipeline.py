@@ -0,0 +1,68 @@
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from document import as_document
+from pipeline import ScoringPipeline, Stage
+
+
+def test_memoized_stage_values_are_not_shared_between_runs():
+    calls = []
+
+    def breakdown(document, job_profile, inputs):
+        calls.append(job_profile)
+        return 1, {"links": ["github"]}
+
+    pipeline = ScoringPipeline([Stage("links", breakdown, profile_dependent=False)])
+    document = as_document({"name": "Jane Doe", "skills": ["Python"]})
+    first, _ = pipeline.run(document, {"title": "Data Analyst"})
+    first["links"][1]["links"].append("linkedin")
+    second, _ = pipeline.run(document, {"title": "Backend Engineer"})
+    assert len(calls) == 1
+    assert second["links"] == (1, {"links": ["github"]})
+
+
+def test_precomputed_features_survive_pickling_and_are_not_recomputed():
+    calls = []
+
+    def independent(document, job_profile, inputs):
+        calls.append("independent")
+        return len(document.text)
+
+    def dependent(document, job_profile, inputs):
+        calls.append("dependent")
+        return inputs["independent"] + len(job_profile["title"])
+
+    pipeline = ScoringPipeline([
+        Stage("independent", independent, profile_dependent=False),
+        Stage("dependent", dependent, requires=["independent"]),
+    ])
+    document = pipeline.precompute(as_document({"name": "Jane Doe", "skills": ["Python"]}))
+    assert calls == ["independent"]
+
+    # As if sent back from a worker process
+    document = pickle.loads(pickle.dumps(document))
+    results, _ = pipeline.run(document, {"title": "Analyst"})
+    assert results == {"independent": 15, "dependent": 22}
+    assert calls == ["independent", "dependent"]
+
+
+def test_precomputed_stage_values_are_used_as_given():
+    pipeline = ScoringPipeline([Stage("a", lambda d, p, i: 1), Stage("b", lambda d, p, i: i["a"] + 1, requires=["a"])])
+    results, timings = pipeline.run(as_document({}), {}, precomputed={"a": 10})
+    assert results == {"a": 10, "b": 11}
+    assert timings["a"] == 0.0
+
+
+def test_concurrent_memo_lookups_compute_once():
+    document = as_document({"name": "Jane Doe"})
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(lambda _: document.memo("slow", slow), range(8))) == [42] * 8
+    assert len(calls) == 1
@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+import batch
+import cache
+from parser import PARSER_VERSION
+from records import RECORD_VERSION, Job, Link, ParsedResume, pack
+
+OLD_STYLE = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "phone": None,
+    "links": [{"type": "github", "url": "github.com/jdoe"}],
+    "professional_summary": ["Backend engineer"],
+    "work_experience": [
+        {"start_date": "Jan 2019", "end_date": "Present", "description": ["Led a team"], "title": "Engineer",
+         "company": "Acme"},
+        {"title": None, "company": None, "dates": None, "description": ["Freelance"]},
+    ],
+    "education": ["B.Tech"],
+    "skills": ["Python", "SQL"],
+    "projects": [],
+    "achievements": [],
+    "certifications": [],
+}
+
+
+def test_dict_view_matches_the_old_dicts():
+    record = ParsedResume.from_dict(OLD_STYLE)
+    assert record.to_dict() == OLD_STYLE
+    assert [list(job) for job in record["work_experience"]] == [list(job) for job in OLD_STYLE["work_experience"]]
+    assert isinstance(record.work_experience[0], Job) and isinstance(record.links[0], Link)
+
+
+def test_binary_and_pickle_round_trips():
+    record = ParsedResume.from_dict(OLD_STYLE)
+    assert ParsedResume.from_bytes(record.to_bytes()) == record
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_unreadable_cache_entry_is_a_miss(tmp_path, monkeypatch):
+    parsed_cache = cache.ContentCache("parsed_resumes", directory=str(tmp_path))
+    monkeypatch.setitem(cache._caches, "parsed_resumes", parsed_cache)
+    data = b"not a resume"
+    key = cache.content_key(data, f"{PARSER_VERSION}:{RECORD_VERSION}")
+    parsed_cache.put(key, b"\xff" + pack(("text", ())))
+    # The bad entry is skipped and the file is extracted again (and rejected, being junk)
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        batch.extract_and_parse("junk.pdf", data)
@@ -0,0 +1,48 @@
+import sys
+import types
+
+import pytest
+
+import resources
+
+
+class FakeTok2Vec:
+    def __init__(self, listeners):
+        self.listening_components = listeners
+
+
+class FakeNLP:
+    def __init__(self, listeners):
+        self.pipes = {"tok2vec": FakeTok2Vec(listeners), "ner": object()}
+
+    @property
+    def pipe_names(self):
+        return list(self.pipes)
+
+    def get_pipe(self, name):
+        return self.pipes[name]
+
+    def remove_pipe(self, name):
+        return name, self.pipes.pop(name)
+
+
+@pytest.mark.parametrize("listeners, pipes", [([], ["ner"]), (["ner"], ["tok2vec", "ner"])])
+def test_tok2vec_is_dropped_only_when_ner_does_not_listen_to_it(monkeypatch, listeners, pipes):
+    loaded = []
+
+    def load(name, exclude=()):
+        loaded.append((name, tuple(exclude)))
+        return FakeNLP(listeners)
+
+    monkeypatch.setitem(sys.modules, "spacy", types.SimpleNamespace(load=load))
+    assert resources._load_spacy_model().pipe_names == pipes
+    assert loaded == [(resources.SPACY_MODELS[0], tuple(resources.SPACY_EXCLUDE))]
+
+
+def test_missing_nltk_data_is_not_downloaded_by_default(monkeypatch):
+    nltk = pytest.importorskip("nltk")
+    monkeypatch.setattr(resources, "ALLOW_DOWNLOADS", False)
+    monkeypatch.setitem(resources.NLTK_RESOURCES, "nothing_here", "corpora/nothing_here")
+    monkeypatch.setattr(nltk, "download", lambda *args, **kwargs: pytest.fail("tried to download"))
+    with pytest.raises(LookupError, match=r"nothing_here.*python -m nltk\.downloader nothing_here"):
+        resources.ensure_nltk_data("nothing_here")
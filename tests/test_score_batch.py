@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+
+import score_batch
+
+
+class WorkerKiller:
+    """Stands in for a file's bytes; unpickling it in a worker kills that worker, like an OOM kill would."""
+
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+def test_run_continues_after_a_worker_crash(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESUME_PARSER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("RESUME_PARSER_ALLOW_DOWNLOADS", "0")
+    names = [f"resume_{n}.pdf" for n in range(6)]
+
+    def fake_files(path):
+        yield names[0], lambda: WorkerKiller()
+        for name in names[1:]:
+            yield name, lambda: b"not really a pdf"
+
+    output = tmp_path / "results.jsonl"
+    monkeypatch.setattr(score_batch, "iter_resume_files", fake_files)
+    monkeypatch.setattr(sys, "argv", ["score_batch.py", "inputs", "-o", str(output), "--workers", "1",
+                                      "--level", "Intern", "--role", "Data Analyst"])
+    score_batch.main()
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(row["name"] for row in rows) == names
+    by_name = {row["name"]: row for row in rows}
+    assert by_name[names[0]]["error"] == "Worker process crashed"
+    assert by_name[names[0]]["seconds"] == 0.0
+    # Only the file that killed the worker fails; the one in flight next to it is retried
+    assert all(by_name[name]["error"] != "Worker process crashed" for name in names[1:])
+    # The crashed file is not checkpointed, so running again retries it and nothing else
+    checkpoint = (tmp_path / "results.jsonl.checkpoint").read_text().splitlines()
+    assert sorted(json.loads(line) for line in checkpoint[1:]) == names[1:]
+
+    score_batch.main()
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row["name"] for row in rows[len(names):]] == [names[0]]
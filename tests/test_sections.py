@@ -0,0 +1,120 @@
+import pytest
+
+from parser import extract_sections
+from sections import HEADER, split_sections
+
+# The original extract_sections: a line under 30 characters that contains a header anywhere is a heading
+BASELINE_HEADERS = [
+    "professional summary", "summary", "objective",
+    "work experience", "experience", "employment history",
+    "education",
+    "skills", "technical skills",
+    "projects",
+    "achievements", "awards",
+    "certifications", "licenses & certifications"
+]
+BASELINE_NAMES = {"professional summary": "professional_summary", "summary": "professional_summary",
+                  "objective": "professional_summary", "work experience": "work_experience",
+                  "experience": "work_experience", "employment history": "work_experience",
+                  "technical skills": "skills", "awards": "achievements"}
+
+
+def baseline_sections(text: str) -> dict:
+    sections = {"header": []}
+    current_section = "header"
+    for line in text.split("\n"):
+        line_lower = line.lower().strip()
+        is_header = False
+        for header in BASELINE_HEADERS:
+            if header in line_lower and len(line_lower) < 30:
+                current_section = header
+                sections.setdefault(current_section, [])
+                is_header = True
+                break
+        if not is_header and line.strip():
+            sections[current_section].append(line.strip())
+    # Under canonical names, merging the headers that mean the same section
+    merged = {}
+    for header, lines in sections.items():
+        merged.setdefault(BASELINE_NAMES.get(header, header), []).extend(lines)
+    return merged
+
+
+SAMPLE_RESUMES = [
+    """Jane Doe
+jane.doe@example.com | +1 555 010 2030
+linkedin.com/in/janedoe
+
+PROFESSIONAL SUMMARY
+Data analyst with four years of experience in retail analytics.
+
+WORK EXPERIENCE
+Data Analyst, Acme Corp
+Jan 2020 - Present
+Built weekly sales dashboards in Tableau.
+
+EDUCATION
+B.Sc. Statistics, State University, 2019
+
+TECHNICAL SKILLS
+Python, SQL, Tableau, Excel
+
+CERTIFICATIONS
+Google Data Analytics Certificate""",
+    """John Smith
+Backend developer | john@example.com
+
+Summary:
+Backend engineer focused on Node.js and .NET services.
+
+Employment History -
+Software Developer at Initech (2018 - 2022)
+  Migrated the billing service to .NET 6.
+
+Skills:
+C++, Node.js, .NET, PostgreSQL
+
+Projects
+Open-source CLI for log search
+
+Awards
+Hackathon winner 2021
+
+Licenses & Certifications
+AWS Certified Developer""",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLE_RESUMES)
+def test_sample_resumes_split_like_the_baseline(text):
+    assert extract_sections(text) == baseline_sections(text)
+
+
+@pytest.mark.parametrize("heading", ["SKILLS", "Skills", "skills", "Skills:", "  Skills  ", "Skills -", "Skills:-",
+                                     "1. Skills", "■ Skills", "Technical Skills", "TECHNICAL  SKILLS:"])
+def test_heading_case_and_punctuation_variants(heading):
+    text = f"Jane Doe\n{heading}\nPython, SQL\nEducation\nB.Sc. Statistics"
+    assert extract_sections(text) == baseline_sections(text)
+    assert extract_sections(text)["skills"] == ["Python, SQL"]
+
+
+def test_heading_at_offset_zero():
+    text = "Experience\nData Analyst, Acme Corp\nSkills\nPython"
+    assert extract_sections(text) == baseline_sections(text)
+    header, experience, skills = split_sections(text)
+    assert (header.name, header.end) == (HEADER, 0)
+    assert (experience.name, experience.start, experience.heading) == ("work_experience", 0, "Experience")
+    assert skills.body(text) == "Python"
+
+
+@pytest.mark.parametrize("text", ["", "Jane Doe\njane@example.com\n+1 555 010 2030"])
+def test_text_without_headings_is_all_header(text):
+    assert extract_sections(text) == baseline_sections(text)
+    assert [(section.name, section.start, section.end) for section in split_sections(text)] == [(HEADER, 0, len(text))]
+
+
+def test_short_lines_that_mention_a_heading_stay_content():
+    # The baseline took any short line containing "skills" or "projects" for a heading
+    text = "Jane Doe\nExperience\nLed 3 projects\nSoft skills coach"
+    assert baseline_sections(text)["projects"] == []
+    assert extract_sections(text)["work_experience"] == ["Led 3 projects", "Soft skills coach"]
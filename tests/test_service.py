@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer
+
+from service import ScoringService, create_app
+
+
+def test_finished_jobs_release_their_uploads(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESUME_PARSER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("RESUME_PARSER_ALLOW_DOWNLOADS", "0")
+
+    async def scenario():
+        service = ScoringService(workers=1, queue_size=2)
+        async with TestClient(TestServer(create_app(service))) as client:
+            response = await client.post("/score?level=Nope&role=Nope", data=b"x" * 1024)
+            assert response.status == 400
+
+            response = await client.post("/parse?name=junk.pdf", data=b"not a resume")
+            assert response.status == 202
+            job_id = (await response.json())["job_id"]
+            job = await (await client.get(f"/jobs/{job_id}?wait=20")).json()
+            assert job["status"] == "failed"
+            assert "Unsupported file format" in job["error"]
+            assert service.jobs[job_id].run is None
+
+    asyncio.run(scenario())
+
+
+def test_rank_rejects_more_files_than_it_may_run_at_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESUME_PARSER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("RESUME_PARSER_ALLOW_DOWNLOADS", "0")
+
+    async def scenario():
+        service = ScoringService(workers=1, queue_size=2, max_rank_files=2)
+        async with TestClient(TestServer(create_app(service))) as client:
+            form = aiohttp.FormData()
+            for n in range(3):
+                form.add_field("file", b"not a resume", filename=f"resume_{n}.pdf")
+            response = await client.post("/rank?level=Intern&role=Data Analyst", data=form)
+            assert response.status == 413
+            assert not service.jobs
+
+    asyncio.run(scenario())
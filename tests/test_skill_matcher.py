@@ -0,0 +1,46 @@
+import re
+
+import pytest
+
+from parser import all_known_skills
+from skill_matcher import SkillMatcher
+
+SKILLS = all_known_skills + [".NET", "C", "Java", "R&D"]
+
+
+def baseline_extract_skills(text: str, known_skills: list) -> list:
+    """The original parser.extract_skills: one whole-word, case-insensitive regex per skill."""
+    found_skills = set()
+    for skill in known_skills:
+        pattern = r"\b" + re.escape(skill) + r"\b"
+        if re.search(pattern, text, re.IGNORECASE):
+            found_skills.add(skill)
+    return sorted(list(found_skills))
+
+
+@pytest.mark.parametrize("text", [
+    # Skills ending in punctuation: \b after "+" or "#" needs a word character next
+    "C++, C#, Java", "C++ and C# developer", "C++11", "c++17 and C#9",
+    "Node.js, Express.js and Vue.js", "node.js/express.js", "Node.jsx",
+    # Skills starting with punctuation: \b before "." needs a word character before it
+    ".NET Core", "ASP.NET MVC", "C#/.NET", "Worked on .NET 6", "dotnet.NET",
+    # Skills inside other words
+    "JavaScript and TypeScript only", "Google Cloud, not Go", "MySQL and PostgreSQL", "R&D team using R",
+    "Rusty Swiftness", "Reactive programming", "React Native apps", "GoLang", "Gitlab ci",
+    # Separators and case
+    "CI/CD pipelines on AWS", "ci/cd", "PYTHON,SQL;docker|KUBERNETES", "Scikit-learn, scikit-learning",
+    "Machine  Learning", "machine learning", "İstanbul Python meetup", "", "   ",
+])
+def test_matches_the_baseline_regexes(text):
+    assert SkillMatcher(SKILLS).extract(text) == baseline_extract_skills(text, SKILLS)
+
+
+@pytest.mark.parametrize("text", ["Python, C++, Node.js and .NET", "React Native and React", "İİ Go"])
+def test_match_offsets_point_at_the_skill(text):
+    for start, end, skill in SkillMatcher(SKILLS).find_matches(text):
+        assert text[start:end].lower() == skill.lower()
+
+
+def test_substring_matching_without_word_boundaries():
+    matcher = SkillMatcher(["Java", "Go"], whole_words=False)
+    assert matcher.extract("JavaScript at Google") == ["Go", "Java"]
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from document import as_document
+from new_scoring import score_skill_alignment, score_skill_alignment_batch
+from skill_matrix import flatten_profiles, rank_matrix
+
+with open("job_profile.json") as f:
+    JOB_PROFILES = json.load(f)
+
+RESUMES = [
+    {
+        "name": "Jane Doe",
+        "work_experience": [{"title": "Data Analyst", "company": "Acme", "start_date": "Jan 2021",
+                             "end_date": "Present", "description": ["Built dashboards in Tableau and Power BI",
+                                                                    "Automated reports with Python and SQL"]}],
+        "projects": ["Churn model with scikit-learn and pandas", "REST API in Flask"],
+        "skills": ["Python, SQL, Excel, Machine Learning", "Git, Docker"],
+        "education": ["B.Tech Computer Science"],
+    },
+    {
+        "name": "John Roe",
+        "professional_summary": ["Frontend developer who loves React, JavaScript and CSS"],
+        "projects": ["Portfolio site in React and TypeScript", "github.com/jroe"],
+        "skills": ["HTML, CSS, JavaScript, React, Node.js"],
+    },
+    # Terms that only appear across the join of the project and skills text, or nowhere
+    {"name": "Edge Case", "projects": ["data"], "skills": ["analysis"]},
+    {},
+]
+
+
+def sorted_breakdown(breakdown):
+    return {key: sorted(value) for key, value in breakdown.items()}
+
+
+@pytest.mark.parametrize("key, profile", flatten_profiles(JOB_PROFILES))
+def test_batch_matches_score_skill_alignment(key, profile):
+    documents = [as_document(resume) for resume in RESUMES]
+    for document, (score, breakdown) in zip(documents, score_skill_alignment_batch(documents, profile)):
+        expected_score, expected_breakdown = score_skill_alignment(document, profile)
+        assert score == expected_score
+        assert sorted_breakdown(breakdown) == sorted_breakdown(expected_breakdown)
+
+
+def test_rank_matrix_matches_score_skill_alignment():
+    documents = [as_document(resume) for resume in RESUMES]
+    keys, totals = rank_matrix(documents, JOB_PROFILES)
+    profiles = dict(flatten_profiles(JOB_PROFILES))
+    for row, document in enumerate(documents):
+        for col, key in enumerate(keys):
+            assert totals[row, col] == score_skill_alignment(document, profiles[key])[0]
+
+
+def test_rank_candidates_matches_score_resume(tmp_path, monkeypatch):
+    nltk = pytest.importorskip("nltk")
+    try:
+        nltk.data.find("corpora/wordnet")
+    except LookupError:
+        pytest.skip("NLTK wordnet data is not installed")
+    import grammar
+    from batch import rank_candidates
+    from new_scoring import score_resume
+
+    monkeypatch.setattr(grammar, "_backend", grammar.NullBackend())
+    (key, profile), *_ = flatten_profiles(JOB_PROFILES)
+    candidates = [{"name": str(i), "document": as_document(resume)} for i, resume in enumerate(RESUMES)]
+    for result in rank_candidates(candidates, profile):
+        expected = score_resume(as_document(RESUMES[int(result["name"])]), profile)
+        assert result["score"] == expected["total_score"]
+        assert result["details"]["skill_alignment_score"] == expected["skill_alignment_score"]
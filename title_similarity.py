@@ -0,0 +1,88 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Character n-gram size used for title matching; bigrams track SequenceMatcher.ratio() most closely
+NGRAM = 2
+
+
+def preprocess(text: str) -> str:
+    """Lowercases the text and collapses punctuation and whitespace runs into single spaces."""
+    return re.sub(r"[^a-z0-9+#]+", " ", text.lower()).strip()
+
+
+def char_ngrams(text: str, n: int = NGRAM) -> frozenset:
+    """The set of character n-grams of a preprocessed text, padded so word edges count."""
+    if not text:
+        return frozenset()
+    padded = f" {text} "
+    if len(padded) <= n:
+        return frozenset([padded])
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+def title_similarity(a: str, b: str) -> float:
+    """
+    Similarity (0-1) of two texts from their distinct character bigrams:
+    2 * shared / (bigrams in a + bigrams in b), so identical texts score 1.
+    Like SequenceMatcher.ratio() it rewards shared substrings and is diluted by
+    extra text on either side, but it is linear in the length of the texts.
+    """
+    a, b = char_ngrams(preprocess(a)), char_ngrams(preprocess(b))
+    total = len(a) + len(b)
+    if not total:
+        return 0.0
+    return 2 * len(a & b) / total
+
+
+class TitleIndex:
+    """
+    Many job titles encoded once as 0/1 bigram vectors, for batched matching.
+
+    similarity() scores N lines against all M titles with a single matrix product;
+    each entry equals title_similarity(line, title). Line bigrams that appear in no
+    title only count towards the line's size, so the vocabulary stays as small as
+    the titles themselves.
+    """
+
+    def __init__(self, titles):
+        self.titles = list(titles)
+        texts = [preprocess(title) for title in self.titles]
+        grams = [char_ngrams(text) for text in texts]
+        self.vocabulary = {gram: i for i, gram in enumerate(sorted(set().union(*grams)))}
+        self.matrix = np.zeros((len(self.titles), len(self.vocabulary)), dtype=np.float32)
+        for row, title_grams in enumerate(grams):
+            self.matrix[row, [self.vocabulary[gram] for gram in title_grams]] = 1
+        self.sizes = np.array([len(title_grams) for title_grams in grams], dtype=np.float32)
+
+    def encode(self, lines) -> tuple:
+        """Returns (N x V 0/1 matrix of the lines' known bigrams, each line's distinct bigram count)."""
+        lines = list(lines)
+        matrix = np.zeros((len(lines), len(self.vocabulary)), dtype=np.float32)
+        sizes = np.zeros(len(lines), dtype=np.float32)
+        for row, line in enumerate(lines):
+            grams = char_ngrams(preprocess(line))
+            sizes[row] = len(grams)
+            matrix[row, [self.vocabulary[gram] for gram in grams if gram in self.vocabulary]] = 1
+        return matrix, sizes
+
+    def similarity(self, lines) -> np.ndarray:
+        """N x M title similarities (0-1) of each line against each title."""
+        matrix, sizes = self.encode(lines)
+        shared = matrix @ self.matrix.T
+        total = sizes[:, None] + self.sizes[None, :]
+        return np.divide(2 * shared, total, out=np.zeros_like(shared), where=total > 0)
+
+    def best(self, lines) -> np.ndarray:
+        """For each title, the similarity of the best-matching line (0 if there are no lines)."""
+        scores = self.similarity(lines)
+        if scores.shape[0] == 0:
+            return np.zeros(len(self.titles), dtype=np.float32)
+        return scores.max(axis=0)
+
+
+@lru_cache(maxsize=64)
+def get_title_index(titles: tuple) -> TitleIndex:
+    """A shared TitleIndex for a tuple of titles, so a profile set is encoded once."""
+    return TitleIndex(titles)
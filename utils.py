@@ -1,4 +1,7 @@
 import json
+import os
+import threading
+from collections.abc import Mapping
 
 def load_job_profiles(file_path: str = "job_profile.json") -> dict:
     """
@@ -19,3 +22,139 @@ def load_job_profiles(file_path: str = "job_profile.json") -> dict:
     except json.JSONDecodeError:
         print(f"Error: The file {file_path} is not a valid JSON file.")
         return {}
+
+
+def _lowered(terms) -> tuple:
+    """Lowercases a list of terms, dropping repeats but keeping the original order."""
+    return tuple(dict.fromkeys(term.lower() for term in terms))
+
+
+class CompiledProfile(Mapping):
+    """
+    A job profile with its term lists lowercased and merged once, up front.
+
+    It still reads like the raw profile dict (profile.get("title"), profile["min_experience"], ...),
+    so it can be passed anywhere a profile from job_profile.json is expected.
+    """
+
+    def __init__(self, profile: dict, level: str = None, role: str = None):
+        self.raw = dict(profile)
+        self.level = level
+        self.role = role
+        self.title = profile.get("title", role or "")
+        self.title_lower = self.title.lower()
+        self.min_experience = profile.get("min_experience", 0)
+        self.required_skills = _lowered(profile.get("required_skills", []))
+        self.preferred_skills = _lowered(profile.get("preferred_skills", []))
+        # keywords and job_specific_keywords are always scored together
+        self.keywords = _lowered(profile.get("keywords", []) + profile.get("job_specific_keywords", []))
+        # Repeats are kept here: each listed degree/certificate earns its own point
+        self.edu_keywords = tuple(term.lower() for term in profile.get("edu_keywords", []))
+        self.relevant_certs = tuple(term.lower() for term in profile.get("relevant_certs", []))
+        self.required_set = frozenset(self.required_skills)
+        self.preferred_set = frozenset(self.preferred_skills)
+        self.keyword_set = frozenset(self.keywords)
+        self.terms = frozenset(self.required_skills + self.preferred_skills + self.keywords
+                               + self.edu_keywords + self.relevant_certs)
+
+    def __getitem__(self, key):
+        return self.raw[key]
+
+    def __iter__(self):
+        return iter(self.raw)
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __repr__(self):
+        return f"CompiledProfile({self.level!r}, {self.role!r})"
+
+
+def compile_profile(job_profile) -> CompiledProfile:
+    """Returns job_profile as a CompiledProfile, compiling it if it is a raw dict."""
+    if isinstance(job_profile, CompiledProfile):
+        return job_profile
+    return CompiledProfile(job_profile)
+
+
+class ProfileIndex:
+    """
+    All job profiles compiled, plus an inverted index from each term to the
+    (level, role) keys of the profiles that use it.
+
+    The index watches the file's modification time: get() reloads it when
+    job_profile.json changes, building the new version completely before swapping
+    it in, so readers always see either the old or the new profiles, never a mix.
+    If the new file can't be loaded, the previous profiles stay in use.
+    """
+
+    def __init__(self, file_path: str = "job_profile.json"):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._state = ({}, {}, {})
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self):
+        with open(self.file_path, 'r') as f:
+            raw_profiles = json.load(f)
+        profiles = {}
+        by_key = {}
+        term_index = {}
+        for level, roles in raw_profiles.items():
+            profiles[level] = {}
+            for role, profile in roles.items():
+                compiled = CompiledProfile(profile, level, role)
+                profiles[level][role] = compiled
+                by_key[(level, role)] = compiled
+                for term in compiled.terms:
+                    term_index.setdefault(term, set()).add((level, role))
+        return profiles, by_key, {term: frozenset(keys) for term, keys in term_index.items()}
+
+    def refresh(self):
+        """Reloads the profiles if the file changed since they were last loaded."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        with self._lock:
+            if stamp == self._stamp:
+                return
+            try:
+                self._state = self._load()
+            except FileNotFoundError:
+                print(f"Error: The file {self.file_path} was not found.")
+            except json.JSONDecodeError:
+                print(f"Error: The file {self.file_path} is not a valid JSON file.")
+            # Remember the stamp even on failure so a broken file isn't re-read on every call
+            self._stamp = stamp
+
+    @property
+    def profiles(self) -> dict:
+        """{level: {role: CompiledProfile}}, reloaded if the file changed."""
+        self.refresh()
+        return self._state[0]
+
+    def get(self, level: str, role: str):
+        self.refresh()
+        return self._state[1].get((level, role))
+
+    def profiles_using(self, term: str) -> frozenset:
+        """The (level, role) keys of every profile that lists the term."""
+        self.refresh()
+        return self._state[2].get(term.lower(), frozenset())
+
+
+_profile_indexes = {}
+
+
+def get_profile_index(file_path: str = "job_profile.json") -> ProfileIndex:
+    """The shared ProfileIndex for a profiles file."""
+    if file_path not in _profile_indexes:
+        _profile_indexes[file_path] = ProfileIndex(file_path)
+    return _profile_indexes[file_path]